@@ -0,0 +1,68 @@
+"""Compare the interpreted validation path against compiled schemas.
+
+Run it from the repository root with `python -m benchmarks.compiler`.
+"""
+import timeit
+
+from skame.compiler import compile
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.schemas.base import Map, And, Or, Pipe, Predicate, Optional
+from skame.schemas.types import Int, String, IsNone, Float
+from skame.schemas.strings import NotEmpty, MaxLength
+from skame.schemas.numeric import IsPositiveOrZero
+
+
+ORDER = Map({
+    "id": Int(),
+    "customer": And(String(), NotEmpty(), MaxLength(255)),
+    "email": Or(IsNone(), And(String(), Predicate(lambda email: "@" in email))),
+    "amount": And(Pipe(float), IsPositiveOrZero()),
+    Optional("discount"): Or(IsNone(), Float()),
+    "address": Map({
+        "street": And(String(), NotEmpty()),
+        "city": And(String(), NotEmpty()),
+        Optional("zip"): And(Pipe(str), MaxLength(10)),
+    }),
+})
+
+VALID = {
+    "id": 1,
+    "customer": "John Doe",
+    "email": "john@example.com",
+    "amount": "12.50",
+    "discount": 0.1,
+    "address": {"street": "Main St", "city": "Springfield", "zip": 12345},
+}
+
+INVALID = {
+    "id": "1",
+    "customer": "",
+    "email": 3,
+    "amount": "free",
+    "address": {"street": "", "zip": "x" * 20},
+}
+
+
+def run(validate, data):
+    try:
+        validate(data)
+    except (SchemaError, SchemaErrors):
+        pass
+
+
+def measure(validate, data, number):
+    return min(timeit.repeat(lambda: run(validate, data), number=number, repeat=5)) / number
+
+
+def main(number=20000):
+    compiled = compile(ORDER)
+    print("{:<10} {:>14} {:>14} {:>9}".format("payload", "interpreted", "compiled", "speedup"))
+    for name, data in (("valid", VALID), ("invalid", INVALID)):
+        interpreted_time = measure(ORDER.validate, data, number)
+        compiled_time = measure(compiled, data, number)
+        print("{:<10} {:>12.2f}us {:>12.2f}us {:>8.2f}x".format(
+            name, interpreted_time * 1e6, compiled_time * 1e6, interpreted_time / compiled_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measure the memory taken by schema validators.
+
+Builds one `Map` per tenant, like applications with a schema per tenant configuration do at
+startup, and reports the bytes allocated per schema and per validator of the schema trees, with
+and without interning the schemas.
+
+Run it from the repository root with `python -m benchmarks.memory [tenants] [revision]`. When a
+git revision is given, the schemas of that revision are measured too, to compare the memory
+before and after a change.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from skame.schemas.base import Schema, Map, And, Or, Pipe, Optional
+from skame.schemas.common import Choices
+from skame.schemas.types import Int, String, IsNone, Bool
+from skame.schemas.strings import Email, NotEmpty, MaxLength, ISODate, URL
+from skame.schemas.numeric import IsPositiveOrZero, MaxValue
+
+
+def tenant_schema(tenant):
+    return Map({
+        "id": Int(),
+        "name": And(String(), NotEmpty(), MaxLength(255)),
+        "email": Or(IsNone(), Email()),
+        "website": Or(IsNone(), URL()),
+        "amount": And(Pipe(float), IsPositiveOrZero(), MaxValue(1000 + tenant)),
+        "date": ISODate(),
+        "active": Bool(),
+        "plan": Choices(["free", "pro", "enterprise"]),
+        Optional("notes"): And(String(), MaxLength(1000)),
+        "address": Map({
+            "street": And(String(), NotEmpty(), MaxLength(255)),
+            "city": And(String(), NotEmpty(), MaxLength(255)),
+            Optional("zip"): And(Pipe(str), MaxLength(10)),
+        }),
+    })
+
+
+def walk(value, seen):
+    # validators reachable from the attributes of the value, so it works with the schemas of any
+    # revision
+    if isinstance(value, Schema):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        yield value
+        attributes = list(getattr(value, "__dict__", {}).values())
+        for cls in type(value).__mro__:
+            attributes.extend(getattr(value, name) for name in cls.__dict__.get("__slots__", ())
+                              if hasattr(value, name))
+    elif isinstance(value, dict):
+        attributes = value.values()
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        attributes = value
+    else:
+        return
+    for attribute in attributes:
+        yield from walk(attribute, seen)
+
+
+def measure(build, tenants):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    schemas = [build(tenant) for tenant in range(tenants)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    nodes = [node for schema in schemas for node in walk(schema, set())]
+    with_dict = sum(hasattr(node, "__dict__") for node in nodes)
+    return size, len(nodes), len({id(node) for node in nodes}), with_dict
+
+
+def report(name, tenants, size, nodes, unique, with_dict):
+    print("{:<20} {:>8} {:>8} {:>8} {:>14.0f} {:>14.0f} {:>14}".format(
+        name, tenants, nodes, unique, size / tenants, size / nodes, with_dict))
+
+
+def measure_revision(revision, tenants):
+    # this script runs against the `skame` package of the revision, extracted in a temporary
+    # directory, and prints its rows
+    with tempfile.TemporaryDirectory() as directory:
+        archive = subprocess.run(["git", "archive", revision, "skame"], check=True,
+                                 stdout=subprocess.PIPE).stdout
+        subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+        env = dict(os.environ, PYTHONPATH=directory, SKAME_MEMORY_LABEL=revision)
+        subprocess.run([sys.executable, os.path.abspath(__file__), str(tenants)], env=env,
+                       check=True, stdout=sys.stdout)
+
+
+def main(tenants=1000, revision=None):
+    label = os.environ.get("SKAME_MEMORY_LABEL")
+    if label is None:
+        print("{:<20} {:>8} {:>8} {:>8} {:>14} {:>14} {:>14}".format(
+            "", "schemas", "nodes", "unique", "bytes/schema", "bytes/node", "with __dict__"))
+        sys.stdout.flush()
+        if revision is not None:
+            measure_revision(revision, tenants)
+        label = "current"
+
+    size, nodes, unique, with_dict = measure(tenant_schema, tenants)
+    report(label, tenants, size, nodes, unique, with_dict)
+    try:
+        from skame.interning import Registry
+    except ImportError:
+        # revisions without interning
+        return
+    registry = Registry()
+    # the nodes of interned schemas are shared, so they are counted like in the plain schemas
+    size, _, unique, with_dict = measure(lambda tenant: registry.intern(tenant_schema(tenant)),
+                                         tenants)
+    report(label + " interned", tenants, size, nodes, unique, with_dict)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000, *args[1:2])
@@ -0,0 +1,57 @@
+"""Measure how ParallelValidator scales with the number of worker processes.
+
+Run it from the repository root with `python -m benchmarks.parallel [records]`.
+"""
+import os
+import sys
+import time
+
+from skame.parallel import ParallelValidator
+from skame.schemas.base import Map, And, Or, Pipe, Optional
+from skame.schemas.types import String, IsNone
+from skame.schemas.strings import Email, NotEmpty, MaxLength, ISODate
+from skame.schemas.numeric import IsPositiveOrZero
+
+
+SCHEMA = Map({
+    "id": Pipe(int),
+    "customer": And(String(), NotEmpty(), MaxLength(255)),
+    "email": Or(IsNone(), Email()),
+    "amount": And(Pipe(float), IsPositiveOrZero()),
+    "date": ISODate(),
+    Optional("notes"): And(String(), MaxLength(1000)),
+})
+
+
+def records(count):
+    for index in range(count):
+        yield {
+            "id": str(index),
+            "customer": "Customer {}".format(index),
+            "email": "customer{}@example.com".format(index) if index % 10 else "invalid",
+            "amount": "{}.{}".format(index % 1000, index % 100),
+            "date": "2016-{:02d}-{:02d}".format(index % 12 + 1, index % 28 + 1),
+        }
+
+
+def measure(workers, count):
+    with ParallelValidator("benchmarks.parallel:SCHEMA", workers=workers, chunksize=2000) as validator:
+        start = time.perf_counter()
+        for _ in validator.validate_many(records(count)):
+            pass
+        return time.perf_counter() - start
+
+
+def main(count=200000):
+    workers = 1
+    baseline = None
+    print("{:>8} {:>10} {:>14} {:>9}".format("workers", "time", "records/s", "speedup"))
+    while workers <= (os.cpu_count() or 1):
+        elapsed = measure(workers, count)
+        baseline = baseline or elapsed
+        print("{:>8} {:>9.2f}s {:>14.0f} {:>8.2f}x".format(workers, elapsed, count / elapsed, baseline / elapsed))
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""Compare the URL validator against the regular expression it replaced.
+
+Besides common URLs it times adversarial inputs: long hostnames built to make the regular
+expression backtrack. Run it from the repository root with `python -m benchmarks.url`.
+"""
+import re
+import timeit
+
+from skame.schemas.strings import URL
+
+
+LEGACY_REGEX = re.compile(
+    r'^(?:[a-z0-9\.\-]*)://'
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}(?<!-)\.?)|'
+    r'localhost|'
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'
+    r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'
+    r'(?::\d+)?'
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+
+def legacy_check(data, schemes=URL.default_schemes):
+    return data.split('://')[0].lower() in schemes and LEGACY_REGEX.search(data) is not None
+
+
+INPUTS = [
+    ("domain", "https://www.example.com/path/to/page?query=1"),
+    ("ipv4", "http://192.168.1.1:8080/"),
+    ("ipv6", "http://[2001:db8::7]/c=GB?objectClass?one"),
+    ("invalid", "http://without-dot-part"),
+    ("long labels", "http://" + ("a" * 62 + "-.") * 64 + "com"),
+    ("many labels", "http://" + "a." * 5000 + "-"),
+    ("long tld", "http://a." + "a-" * 5000 + "-"),
+    ("ipv6 colons", "http://[" + "a:" * 5000 + "x"),
+    ("long port", "http://a.com:" + "1" * 10000 + "x"),
+]
+
+
+def measure(check, data, number):
+    return min(timeit.repeat(lambda: check(data), number=number, repeat=5)) / number
+
+
+def main(number=2000):
+    url = URL()
+    print("{:<12} {:>8} {:>14} {:>14} {:>9}".format("input", "length", "regex", "parser",
+                                                    "speedup"))
+    for name, data in INPUTS:
+        assert url._check(data) == legacy_check(data), name
+        regex_time = measure(legacy_check, data, number)
+        parser_time = measure(url._check, data, number)
+        print("{:<12} {:>8} {:>12.2f}us {:>12.2f}us {:>8.2f}x".format(
+            name, len(data), regex_time * 1e6, parser_time * 1e6, regex_time / parser_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,24 @@ setup(
     url='https://github.com/kaleidos/skame',
     license='BSD',
     packages=['skame'],
+    python_requires='>=3.7',
     install_requires=[],
+    extras_require={
+        'numpy': ['numpy'],
+        'dev': ['pytest', 'pyflakes'],
+    },
     setup_requires=[
         'versiontools >= 1.9.1',
     ],
     classifiers=[
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.4",
+        "Programming Language :: Python :: 3 :: Only",
+        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
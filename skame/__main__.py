@@ -0,0 +1,6 @@
+import sys
+
+from skame.cli import main
+
+
+sys.exit(main())
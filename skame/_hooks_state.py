@@ -0,0 +1,98 @@
+"""State of the validation callbacks shared by the schemas and `skame.hooks`.
+
+It doesn't depend on the schemas, so `skame.schemas.base` can call the callbacks of
+`global_hooks` from `Schema.validate`.
+"""
+import time
+
+from skame.exceptions import SchemaError, SchemaErrors
+
+
+class HooksRegistry:
+    """Registry of validation callbacks, see `skame.hooks`.
+
+    The `on_start`, `on_success` and `on_error` methods register a callback and return it, so they
+    can be used as decorators. While no callback is registered `enabled` is False and nothing
+    is called around the validations.
+    """
+
+    def __init__(self):
+        self.start_callbacks = []
+        self.success_callbacks = []
+        self.error_callbacks = []
+        self.enabled = False
+
+    def on_start(self, callback: "callable") -> "callable":
+        self.start_callbacks.append(callback)
+        self.enabled = True
+        return callback
+
+    def on_success(self, callback: "callable") -> "callable":
+        self.success_callbacks.append(callback)
+        self.enabled = True
+        return callback
+
+    def on_error(self, callback: "callable") -> "callable":
+        self.error_callbacks.append(callback)
+        self.enabled = True
+        return callback
+
+    def remove(self, callback: "callable"):
+        """Unregister a callback from all the events it was registered for."""
+        for callbacks in (self.start_callbacks, self.success_callbacks, self.error_callbacks):
+            while callback in callbacks:
+                callbacks.remove(callback)
+        self.enabled = bool(self.start_callbacks or self.success_callbacks or self.error_callbacks)
+
+    def clear(self):
+        """Unregister all the callbacks."""
+        del self.start_callbacks[:], self.success_callbacks[:], self.error_callbacks[:]
+        self.enabled = False
+
+    def _finish(self, path: str, schema: "Schema", start: float, result: tuple) -> tuple:
+        elapsed = time.perf_counter() - start
+        cleaned, error = result
+        if error is None:
+            for callback in self.success_callbacks:
+                callback(path, schema, elapsed, cleaned)
+        else:
+            for callback in self.error_callbacks:
+                callback(path, schema, elapsed, error)
+        return result
+
+    def check(self, schema: "Schema", data: object, path: str="", **kwargs) -> (object, Exception):
+        """Call `schema.check` with the data, calling the callbacks around it.
+
+        Validation errors raised by the schema are reported to the `on_error` callbacks and
+        raised again.
+        """
+        if getattr(schema, "hooks", None) is self:
+            # validators traced by this registry (`skame.hooks.Traced`) call the callbacks
+            # themselves
+            return schema.check(data, **kwargs)
+        for callback in self.start_callbacks:
+            callback(path, schema, data)
+        start = time.perf_counter()
+        try:
+            result = schema.check(data, **kwargs)
+        except (SchemaError, SchemaErrors) as e:
+            self._finish(path, schema, start, (None, e))
+            raise
+        return self._finish(path, schema, start, result)
+
+    async def acheck(self, schema: "Schema", data: object, path: str="") -> (object, Exception):
+        """Asynchronous version of `check`."""
+        if getattr(schema, "hooks", None) is self:
+            return await schema.acheck(data)
+        for callback in self.start_callbacks:
+            callback(path, schema, data)
+        start = time.perf_counter()
+        try:
+            result = await schema.acheck(data)
+        except (SchemaError, SchemaErrors) as e:
+            self._finish(path, schema, start, (None, e))
+            raise
+        return self._finish(path, schema, start, result)
+
+
+global_hooks = HooksRegistry()
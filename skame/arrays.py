@@ -0,0 +1,64 @@
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+ArrayResult = collections.namedtuple("ArrayResult", ("mask", "failed", "messages"))
+ArrayResult.__doc__ = """Result of validating the items of an array at once.
+
+`mask` is a boolean array that is True for the valid items, `failed` the array of indices of the
+invalid items and `messages` an object array with the error message of each failed index.
+"""
+
+
+def as_array(data: object) -> "numpy.ndarray":
+    """Convert the data into a NumPy array, raising `ImportError` if NumPy is not installed."""
+    if numpy is None:
+        raise ImportError("NumPy is required to validate arrays")
+    return numpy.asarray(data)
+
+
+def is_array(data: object) -> bool:
+    """Check if the data is a NumPy array."""
+    return numpy is not None and isinstance(data, numpy.ndarray)
+
+
+def take(column: "sequence", positions: list) -> "sequence":
+    """Select the items of a list or NumPy array at the given positions."""
+    if is_array(column):
+        return column[numpy.asarray(positions, dtype=int)]
+    return [column[position] for position in positions]
+
+
+def mask_result(mask: "numpy.ndarray", message: object) -> ArrayResult:
+    """Build the result of a validation where every invalid item has the same message."""
+    mask = numpy.asarray(mask, dtype=bool)
+    failed = numpy.flatnonzero(~mask)
+    messages = numpy.empty(len(failed), dtype=object)
+    messages.fill(message)
+    return ArrayResult(mask, failed, messages)
+
+
+def result_errors(result: ArrayResult) -> dict:
+    """Convert the result of validating an array into a dict of failed indices to messages."""
+    return dict(zip(result.failed.tolist(), result.messages.tolist()))
+
+
+def all_results(array: "numpy.ndarray", schemas: list) -> ArrayResult:
+    """Validate an array against all the schemas, reporting the message of the first one that
+    rejects each item."""
+    array = as_array(array)
+    mask = numpy.ones(array.shape, dtype=bool)
+    messages = numpy.empty(array.size, dtype=object)
+
+    # the messages of the first schemas are written last so they win over the next ones
+    for schema in reversed(schemas):
+        result = schema.validate_array(array)
+        mask &= result.mask
+        messages[result.failed] = result.messages
+
+    failed = numpy.flatnonzero(~mask)
+    return ArrayResult(mask, failed, messages[failed])
@@ -0,0 +1,262 @@
+"""Benchmark suite for the built-in schemas.
+
+Run it with `python -m skame.bench`. Each benchmark validates a synthetic dataset built with a
+seeded random generator, so the datasets are the same on every run, and the results are printed
+as JSON. Save them and pass them later with `--baseline` to compare the performance of two runs.
+"""
+import argparse
+import collections
+import fnmatch
+import json
+import platform
+import random
+import sys
+import time
+
+from skame.schemas.base import Predicate, Type, StrictType, Is, Pipe, And, Or, Map, Tagged, Optional
+from skame.schemas.common import Choices, Cached
+from skame.schemas.numeric import IsStrictPositive, IsPositiveOrZero, MinValue, MaxValue
+from skame.schemas.strings import (NotEmpty, Regex, URL, Email, ISODate, ISODateTime, ISOTime,
+                                   Length, MaxLength, MinLength)
+from skame.schemas.types import Int, Float, String, IsNone
+
+
+Case = collections.namedtuple("Case", ("name", "schema", "valid", "invalid"))
+Case.__doc__ = """A benchmark: a schema and two functions that build a valid and an invalid item
+for it from a `random.Random` instance."""
+
+VALID_RATIOS = (1.0, 0.5, 0.0)
+
+
+def _word(rng, length=8):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length))
+
+
+def _email(rng):
+    return "{}@{}.com".format(_word(rng), _word(rng, 6))
+
+
+def _url(rng):
+    return "https://www.{}.com/{}?page={}".format(_word(rng, 6), _word(rng), rng.randint(1, 99))
+
+
+def _map_case(fields):
+    schema = Map({"field{}".format(index): Int() for index in range(fields)})
+
+    def valid(rng):
+        return {"field{}".format(index): rng.randint(0, 1000) for index in range(fields)}
+
+    def invalid(rng):
+        item = valid(rng)
+        item["field{}".format(rng.randrange(fields))] = "not an int"
+        return item
+
+    return Case("map/fields={}".format(fields), schema, valid, invalid)
+
+
+def _nested_case(depth):
+    schema = Map({"id": Int(), Optional("name"): String()})
+    for _ in range(depth - 1):
+        schema = Map({"id": Int(), "child": schema})
+
+    def build(rng, leaf_id):
+        item = {"id": leaf_id, "name": _word(rng)}
+        for _ in range(depth - 1):
+            item = {"id": rng.randint(0, 1000), "child": item}
+        return item
+
+    return Case("map/depth={}".format(depth), schema,
+                lambda rng: build(rng, rng.randint(0, 1000)), lambda rng: build(rng, "1"))
+
+
+def _tagged_case(tags):
+    schemas = {"tag{}".format(index): Map({"type": String(), "value": Int()})
+               for index in range(tags)}
+    schema = Tagged("type", schemas)
+
+    def valid(rng):
+        return {"type": "tag{}".format(rng.randrange(tags)), "value": rng.randint(0, 1000)}
+
+    def invalid(rng):
+        return {"type": "tag{}".format(rng.randrange(tags)), "value": _word(rng)}
+
+    return Case("tagged/tags={}".format(tags), schema, valid, invalid)
+
+
+def cases() -> list:
+    """Build the benchmarks of the suite."""
+    choices = ["choice{}".format(index) for index in range(1000)]
+    union = (IsNone(), Int(), Float(), String())
+
+    return [
+        Case("predicate", Predicate(lambda n: n > 0),
+             lambda rng: rng.randint(1, 1000), lambda rng: -rng.randint(0, 1000)),
+        Case("type", Type(str), _word, lambda rng: rng.randint(0, 1000)),
+        Case("strict-type", StrictType(int),
+             lambda rng: rng.randint(0, 1000), lambda rng: float(rng.randint(0, 1000))),
+        Case("is", Is(None), lambda rng: None, lambda rng: rng.randint(0, 1000)),
+        Case("pipe", Pipe(int), lambda rng: str(rng.randint(0, 1000)), _word),
+        Case("and", And(String(), NotEmpty(), MaxLength(20)), _word, lambda rng: ""),
+        Case("or", Or(*union), lambda rng: rng.choice([None, 1, 1.5, "a"]), lambda rng: [1]),
+        Case("or/adaptive", Or(*union, adaptive=True, exclusive=True),
+             lambda rng: rng.choice([None, 1, 1.5, "a"]), lambda rng: [1]),
+        Case("or/predicates", Or(*[Predicate(lambda n, limit=limit: n == limit)
+                                   for limit in range(10)]),
+             lambda rng: rng.randrange(10), lambda rng: rng.randint(10, 1000)),
+        Case("choices", Choices(choices), lambda rng: rng.choice(choices), _word),
+        Case("not-empty", NotEmpty(), _word, lambda rng: ""),
+        Case("regex", Regex(regex=r"^[a-z]+-[0-9]+$"),
+             lambda rng: "{}-{}".format(_word(rng), rng.randint(0, 1000)), _word),
+        Case("url", URL(), _url, lambda rng: "https://{}".format(_word(rng))),
+        Case("email", Email(), _email, _word),
+        Case("email/cached", Cached(Email(), maxsize=100),
+             lambda rng: "user{}@example.com".format(rng.randrange(50)),
+             lambda rng: "user{}".format(rng.randrange(50))),
+        Case("iso-date", ISODate(),
+             lambda rng: "2016-{:02d}-{:02d}".format(rng.randint(1, 12), rng.randint(1, 28)),
+             lambda rng: "2016-{:02d}-30".format(rng.randint(13, 99))),
+        Case("iso-datetime", ISODateTime(),
+             lambda rng: "2016-01-01T{:02d}:{:02d}:00Z".format(rng.randint(0, 23),
+                                                               rng.randint(0, 59)),
+             lambda rng: "2016-01-01T{:02d}:00".format(rng.randint(24, 99))),
+        Case("iso-time", ISOTime(),
+             lambda rng: "{:02d}:{:02d}".format(rng.randint(0, 23), rng.randint(0, 59)),
+             lambda rng: "{:02d}:00".format(rng.randint(24, 99))),
+        Case("length", Length(8), _word, lambda rng: _word(rng, 4)),
+        Case("max-length", MaxLength(10), _word, lambda rng: _word(rng, 20)),
+        Case("min-length", MinLength(4), _word, lambda rng: _word(rng, 2)),
+        Case("is-strict-positive", IsStrictPositive(),
+             lambda rng: rng.randint(1, 1000), lambda rng: -rng.randint(0, 1000)),
+        Case("is-positive-or-zero", IsPositiveOrZero(),
+             lambda rng: rng.randint(0, 1000), lambda rng: -rng.randint(1, 1000)),
+        Case("min-value", MinValue(10),
+             lambda rng: rng.randint(10, 1000), lambda rng: rng.randint(0, 9)),
+        Case("max-value", MaxValue(10),
+             lambda rng: rng.randint(0, 10), lambda rng: rng.randint(11, 1000)),
+        _map_case(5),
+        _map_case(50),
+        _map_case(500),
+        _nested_case(1),
+        _nested_case(5),
+        _nested_case(20),
+        _tagged_case(10),
+    ]
+
+
+def dataset(case: Case, size: int, valid_ratio: float, seed: int) -> list:
+    """Build the items of a benchmark, the same ones for the same arguments."""
+    rng = random.Random("{}:{}:{}".format(seed, case.name, valid_ratio))
+    return [case.valid(rng) if rng.random() < valid_ratio else case.invalid(rng)
+            for _ in range(size)]
+
+
+def measure(check: "callable", items: list, repeat: int) -> float:
+    """Return the best time of validating the items `repeat` times, in nanoseconds per item."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            check(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e9
+
+
+def run(suite: list, size: int=1000, repeat: int=5, seed: int=0,
+        valid_ratios: tuple=VALID_RATIOS) -> dict:
+    """Run the benchmarks of a suite, returning a dict of benchmark names to their results."""
+    results = {}
+    for case in suite:
+        for valid_ratio in valid_ratios:
+            items = dataset(case, size, valid_ratio, seed)
+            results["{}/valid={}".format(case.name, valid_ratio)] = {
+                "ns_per_item": round(measure(case.schema.check, items, repeat), 1),
+                "items": size,
+                "valid_ratio": valid_ratio,
+            }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Compare the results of two runs.
+
+    :returns: A list of `(name, baseline, current, ratio, regressed)` tuples for the benchmarks
+        in both runs, where `regressed` tells if the benchmark is slower than the baseline by more
+        than `threshold` (a fraction of the baseline time).
+    """
+    comparison = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["ns_per_item"], result["ns_per_item"]
+        ratio = after / before if before else float("inf")
+        comparison.append((name, before, after, ratio, ratio > 1 + threshold))
+    return comparison
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m skame.bench", description="Benchmark the built-in schemas.")
+    parser.add_argument("-k", "--filter", action="append", default=[], metavar="PATTERN",
+                        help="Only run the benchmarks with a name matching the glob pattern, "
+                             "can be repeated.")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit.")
+    parser.add_argument("--size", type=int, default=1000, help="Number of items of each dataset.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of times each dataset is validated, the best time is kept.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the datasets.")
+    parser.add_argument("-o", "--output", type=argparse.FileType("w", encoding="utf-8"),
+                        default=sys.stdout, help="File for the JSON results, the standard output "
+                                                 "by default.")
+    parser.add_argument("--baseline", type=argparse.FileType("r", encoding="utf-8"),
+                        help="JSON results of a previous run to compare against. Exits with "
+                             "status 1 when some benchmark is slower.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Fraction of the baseline time a benchmark can be slower without "
+                             "being reported as a regression, 0.1 by default.")
+    return parser
+
+
+def main(argv: list=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    suite = [case for case in cases()
+             if not args.filter or any(fnmatch.fnmatch(case.name, pattern)
+                                       for pattern in args.filter)]
+    if args.list:
+        for case in suite:
+            print(case.name)
+        return 0
+
+    results = run(suite, size=args.size, repeat=args.repeat, seed=args.seed)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "size": args.size,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    json.dump(report, args.output, indent=2, sort_keys=True)
+    args.output.write("\n")
+    if args.output is not sys.stdout:
+        args.output.close()
+
+    if args.baseline is None:
+        return 0
+
+    with args.baseline:
+        baseline = json.load(args.baseline)["results"]
+    regressions = 0
+    print("{:<40} {:>12} {:>12} {:>8}".format("benchmark", "baseline", "current", "ratio"),
+          file=sys.stderr)
+    for name, before, after, ratio, regressed in compare(results, baseline, args.threshold):
+        regressions += regressed
+        print("{:<40} {:>10.1f}ns {:>10.1f}ns {:>7.2f}x{}".format(
+            name, before, after, ratio, "  slower" if regressed else ""), file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
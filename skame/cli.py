@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from skame.compiler import compile
+from skame.exceptions import SchemaError, SchemaErrors, render_error
+from skame.hooks import global_hooks, Traced
+from skame.utils import import_object
+
+
+def validate_stream(check: "callable", lines: "iterable", output: "file", errors: "file") -> (int, int):
+    """Validate a stream of JSON lines writing the cleaned records to `output` and an error report
+    line for each invalid record to `errors`.
+
+    :returns: A tuple with the number of records and the number of invalid records.
+    """
+    records = invalid = 0
+
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        records += 1
+
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            cleaned, error = None, "Invalid JSON: {}".format(e)
+        else:
+            try:
+                cleaned, error = check(data)
+            except (SchemaError, SchemaErrors) as e:
+                cleaned, error = None, e
+            except Exception as e:
+                # schemas can fail on unexpected records, like a list for a `Map`, which must not
+                # stop the rest of the stream
+                cleaned, error = None, "Invalid record: {}: {}".format(type(e).__name__, e)
+
+        if error is None:
+            output.write(json.dumps(cleaned, default=str))
+            output.write("\n")
+        else:
+            invalid += 1
+            errors.write(json.dumps({"line": line_number, "errors": render_error(error)}, default=str))
+            errors.write("\n")
+
+    return records, invalid
+
+
+def compiled_check(schema: "Schema") -> "callable":
+    validate = compile(schema)
+
+    def check(data):
+        try:
+            return validate(data), None
+        except (SchemaError, SchemaErrors) as e:
+            return None, e
+
+    return check
+
+
+def validate_command(args: argparse.Namespace) -> int:
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    schema = import_object(args.schema)
+    if global_hooks.enabled:
+        # like the helpers of `skame.validator`, so the callbacks are called for each record
+        schema = Traced(schema, "", global_hooks)
+    check = compiled_check(schema) if args.compile else schema.check
+
+    start = time.perf_counter()
+    try:
+        records, invalid = validate_stream(check, args.input, args.output, args.errors)
+    finally:
+        for stream in (args.input, args.output, args.errors):
+            if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                stream.close()
+    elapsed = time.perf_counter() - start
+
+    stats = args.stats or sys.stderr
+    if not args.quiet:
+        throughput = records / elapsed if elapsed else 0
+        error_rate = invalid / records if records else 0
+        if stats is args.errors:
+            # after the error report, as one more JSON line so the report stays valid JSON Lines
+            print(json.dumps({"stats": {"records": records, "elapsed": elapsed,
+                                        "throughput": throughput, "invalid": invalid,
+                                        "error_rate": error_rate}}), file=stats)
+        else:
+            print("{} records in {:.2f}s ({:.0f} records/s), {} invalid ({:.2%} error rate)".format(
+                records, elapsed, throughput, invalid, error_rate), file=stats)
+    if stats not in (sys.stdout, sys.stderr):
+        stats.close()
+
+    return 1 if invalid else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m skame", description="Schema validation tools.")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    validate = subparsers.add_parser(
+        "validate", help="Validate a JSON Lines stream against a schema.",
+        description="Validate a JSON Lines stream against a schema, writing the cleaned records "
+                    "and a JSON Lines report of the invalid ones. Exits with status 1 when some "
+                    "record is invalid.")
+    validate.add_argument("input", nargs="?", default="-",
+                          type=argparse.FileType("r", encoding="utf-8"),
+                          help="JSON Lines file to validate, the standard input by default.")
+    validate.add_argument("--schema", required=True,
+                          help="Schema to validate against, in the form `module:attribute`.")
+    validate.add_argument("-o", "--output", default="-",
+                          type=argparse.FileType("w", encoding="utf-8"),
+                          help="File for the valid records, the standard output by default.")
+    validate.add_argument("-e", "--errors", default=sys.stderr,
+                          type=argparse.FileType("w", encoding="utf-8"),
+                          help="File for the error report, the standard error by default.")
+    validate.add_argument("--stats", type=argparse.FileType("w", encoding="utf-8"),
+                          help="File for the throughput stats, the standard error by default. "
+                               "They are written as a JSON line when the error report is "
+                               "written there too.")
+    validate.add_argument("--compile", action="store_true",
+                          help="Compile the schema before validating.")
+    validate.add_argument("-q", "--quiet", action="store_true",
+                          help="Don't print the throughput stats.")
+    validate.set_defaults(handler=validate_command)
+
+    return parser
+
+
+def main(argv: list=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,189 @@
+import builtins
+import itertools
+import linecache
+
+from skame.exceptions import SchemaError, SchemaErrors, render_error
+from skame.utils import LazyJoin
+from skame.schemas.base import (Schema, Predicate, Type, StrictType, Is, Pipe, And, Or, Map,
+                                OPTIONAL, DEPENDENT, _checks_like)
+
+
+def _implements(kind: type, schema_class: type) -> bool:
+    """Check if a schema class validates exactly like one of the schema classes known by the compiler."""
+    return kind.check is schema_class.check and kind.validate is schema_class.validate
+
+
+class _Compiler:
+    """Generate the source code of a function that validates data against a schema tree.
+
+    Each node of the tree is inlined in the generated function, nested blocks that go deeper than
+    `max_depth` are moved into helper functions to stay away from the interpreter block limits.
+
+    Errors are collected without their tracebacks, which would reference the frame of the
+    generated function and keep it alive in a reference cycle.
+    """
+    max_depth = 10
+
+    def __init__(self):
+        self.namespace = {
+            "SchemaError": SchemaError,
+            "SchemaErrors": SchemaErrors,
+            "LazyJoin": LazyJoin,
+            "render_error": render_error,
+        }
+        self.helpers = []
+        self.counter = itertools.count()
+
+    def name(self, prefix: str) -> str:
+        return "{}{}".format(prefix, next(self.counter))
+
+    def const(self, value: object, prefix: str="c") -> str:
+        if type(value) is str:
+            return repr(value)
+        name = self.name(prefix)
+        self.namespace[name] = value
+        return name
+
+    def function(self, name: str, schema: "Schema") -> list:
+        lines = ["def {}(v):".format(name)]
+        self.emit(schema, "v", lines, 1)
+        lines.append("    return v")
+        return lines
+
+    def emit(self, schema: "Schema", var: str, lines: list, depth: int):
+        """Append the lines that validate `var` against `schema` leaving the cleaned value in it."""
+        if depth > self.max_depth:
+            helper = self.name("_helper")
+            self.helpers.append(self.function(helper, schema))
+            self.line(lines, depth, "{0} = {1}({0})".format(var, helper))
+            return
+
+        kind = type(schema)
+        if _implements(kind, Predicate):
+            self.emit_predicate(schema, var, lines, depth)
+        elif _implements(kind, Pipe):
+            self.emit_pipe(schema, var, lines, depth)
+        elif _implements(kind, And):
+            for condition in schema.conditions:
+                self.emit(condition, var, lines, depth)
+        elif _implements(kind, Or):
+            self.emit_or(schema, var, lines, depth)
+        elif _implements(kind, Map):
+            self.emit_map(schema, var, lines, depth)
+        else:
+            validate = self.const(schema.validate, "validate")
+            self.line(lines, depth, "{0} = {1}({0})".format(var, validate))
+
+    def emit_predicate(self, schema: "Predicate", var: str, lines: list, depth: int):
+        # subclasses that override the predicate are called like any other predicate
+        if _checks_like(schema, Type):
+            test = "isinstance({}, {})".format(var, self.const(schema.type, "type"))
+        elif _checks_like(schema, StrictType):
+            test = "type({}) is {}".format(var, self.const(schema.type, "type"))
+        elif _checks_like(schema, Is):
+            test = "{} is {}".format(var, self.const(schema.obj, "obj"))
+        else:
+            test = "{}({})".format(self.const(schema.predicate, "predicate"), var)
+        get_error = self.const(schema.get_error, "get_error")
+        self.line(lines, depth, "if not {}:".format(test))
+        self.line(lines, depth + 1, "raise {}({})".format(get_error, var))
+
+    def emit_pipe(self, schema: "Pipe", var: str, lines: list, depth: int):
+        # the error is raised outside of the except block so it doesn't keep the original exception
+        # and its traceback alive as context
+        error, pipe_error = self.name("e"), self.name("pipe_error")
+        message = self.const(schema.message) if schema.message else "str({})".format(error)
+        self.line(lines, depth, "try:")
+        for pipe in schema.pipes:
+            self.line(lines, depth + 1, "{0} = {1}({0})".format(var, self.const(pipe, "pipe")))
+        self.line(lines, depth + 1, "{} = None".format(pipe_error))
+        self.line(lines, depth, "except {} as {}:".format(
+            self.const(schema.watch_for_exceptions, "exceptions"), error))
+        self.line(lines, depth + 1, "{} = SchemaError({})".format(pipe_error, message))
+        self.line(lines, depth, "if {} is not None:".format(pipe_error))
+        self.line(lines, depth + 1, "raise {}".format(pipe_error))
+
+    def emit_or(self, schema: "Or", var: str, lines: list, depth: int):
+        found, messages, value, error = (self.name(p) for p in ("found", "messages", "t", "e"))
+        self.line(lines, depth, "{} = False".format(found))
+        self.line(lines, depth, "{} = []".format(messages))
+        for condition in schema.conditions:
+            self.line(lines, depth, "if not {}:".format(found))
+            self.line(lines, depth + 1, "try:")
+            self.line(lines, depth + 2, "{} = {}".format(value, var))
+            self.emit(condition, value, lines, depth + 2)
+            self.line(lines, depth + 2, "{} = True".format(found))
+            self.line(lines, depth + 1, "except SchemaError as {}:".format(error))
+            self.line(lines, depth + 2, "{}.append({}.with_traceback(None))".format(messages, error))
+        self.line(lines, depth, "if not {}:".format(found))
+        self.line(lines, depth + 1, "raise SchemaError({}, params={{'messages': LazyJoin({}, render_error)}})".format(
+            self.const(schema.message), messages))
+        self.line(lines, depth, "{} = {}".format(var, value))
+
+    def emit_map(self, schema: "Map", var: str, lines: list, depth: int):
+        keys, errors, result, value, error = (self.name(p) for p in ("keys", "errors", "result", "f", "e"))
+        self.line(lines, depth, "{} = {}.keys()".format(keys, var))
+        self.line(lines, depth, "{} = {{}}".format(errors))
+        self.line(lines, depth, "{} = {{}}".format(result))
+
+        dependent_stage = False
+        for field in schema.plan:
+            key = self.const(field.key)
+            field_depth = depth
+
+            if field.kind is DEPENDENT and not dependent_stage:
+                dependent_stage = True
+                self.emit_raise_errors(errors, lines, depth)
+
+            if field.kind is OPTIONAL:
+                self.line(lines, depth, "if {} in {}:".format(self.const(field.lookup, "field"), keys))
+                field_depth += 1
+
+            self.line(lines, field_depth, "try:")
+            if field.kind is DEPENDENT:
+                self.line(lines, field_depth + 1, "{} = {}".format(value, var))
+            else:
+                self.line(lines, field_depth + 1, "{} = {}[{}]".format(
+                    value, var, self.const(field.lookup, "field")))
+            self.emit(field.schema, value, lines, field_depth + 1)
+            self.line(lines, field_depth, "except KeyError:")
+            self.line(lines, field_depth + 1, "{}[{}] = {}".format(errors, key, self.const(field.message)))
+            self.line(lines, field_depth, "except (SchemaError, SchemaErrors) as {}:".format(error))
+            self.line(lines, field_depth + 1, "{}[{}] = {}.with_traceback(None)".format(errors, key, error))
+            self.line(lines, field_depth, "else:")
+            self.line(lines, field_depth + 1, "{}[{}] = {}".format(result, key, value))
+
+        self.emit_raise_errors(errors, lines, depth)
+        self.line(lines, depth, "{} = {}".format(var, result))
+
+    def emit_raise_errors(self, errors: str, lines: list, depth: int):
+        self.line(lines, depth, "if {}:".format(errors))
+        self.line(lines, depth + 1, "raise SchemaErrors({})".format(errors))
+
+    @staticmethod
+    def line(lines: list, depth: int, code: str):
+        lines.append("    " * depth + code)
+
+
+def compile(schema: "Schema") -> "function":
+    """Compile a schema tree into one specialized validation function.
+
+    The returned function accepts the data to validate and returns it cleaned, raising the same
+    `SchemaError` or `SchemaErrors` exceptions that `schema.validate` would raise. `Map`, `And`,
+    `Or`, `Predicate`, `Type`, `StrictType`, `Is` and `Pipe` nodes are inlined in the generated
+    code, any other schema is called through its `validate` method.
+
+    The generated source code is available in the `source` attribute of the function.
+    """
+    compiler = _Compiler()
+    main = compiler.function("validate", schema)
+    source = "\n\n".join("\n".join(lines) for lines in compiler.helpers + [main]) + "\n"
+
+    filename = "<skame-compiled-{}>".format(id(compiler))
+    code = builtins.compile(source, filename, "exec")
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(code, compiler.namespace)
+
+    validate = compiler.namespace["validate"]
+    validate.source = source
+    return validate
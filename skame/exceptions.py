@@ -1,13 +1,86 @@
+_UNRENDERED = object()
+
+
 class SchemaError(Exception):
-    """Exception used to indicate that the validation of some value failed."""
+    """Exception used to indicate that the validation of some value failed.
+
+    The error message can be given as a template and its `params`, in that case the message is
+    only formatted the first time `error` is accessed, or the exception is printed or pickled.
+    """
 
-    def __init__(self, error, error_code="invalid"):
-        self.error = error
+    def __init__(self, error, error_code="invalid", params=None):
+        self.message = error
+        self.params = params
         self.error_code = error_code
+        self._error = error if params is None else _UNRENDERED
+
+    @property
+    def error(self):
+        if self._error is _UNRENDERED:
+            self._error = self.message.format(**self.params)
+        return self._error
+
+    @error.setter
+    def error(self, value):
+        self._error = value
+
+    @property
+    def args(self):
+        return (self.error,)
+
+    def __str__(self):
+        return str(self.error)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.error)
+
+    def __reduce__(self):
+        # the message is rendered before pickling, its params may not be picklable
+        return type(self), (self.error, self.error_code)
 
 
 class SchemaErrors(Exception):
-    """Exception used to indicate that the validation of multiple values failed."""
+    """Exception used to indicate that the validation of multiple values failed.
+
+    The values of the errors dict can be `SchemaError` or `SchemaErrors` exceptions, they are
+    replaced by their messages the first time `errors` is accessed.
+    """
 
     def __init__(self, errors):
-        self.errors = errors
+        self._errors = errors
+        self._rendered = False
+
+    @property
+    def errors(self):
+        if not self._rendered:
+            self._errors = {key: render_error(error) for key, error in self._errors.items()}
+            self._rendered = True
+        return self._errors
+
+    @errors.setter
+    def errors(self, value):
+        self._errors = value
+        self._rendered = False
+
+    @property
+    def args(self):
+        return (self.errors,)
+
+    def __str__(self):
+        return str(self.errors)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.errors)
+
+    def __reduce__(self):
+        return type(self), (self.errors,)
+
+
+def render_error(error: object) -> object:
+    """Return the message of an error: the `error` of a `SchemaError`, the `errors` of a
+    `SchemaErrors` or the error itself otherwise."""
+    if isinstance(error, SchemaError):
+        return error.error
+    if isinstance(error, SchemaErrors):
+        return error.errors
+    return error
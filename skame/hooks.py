@@ -0,0 +1,69 @@
+"""Callbacks around the validation of schemas, to feed metrics, logs or traces.
+
+A `Hooks` registry holds the callbacks called when a validation starts, succeeds or fails:
+
+- `on_start(path, schema, data)`
+- `on_success(path, schema, elapsed, cleaned)`
+- `on_error(path, schema, elapsed, error)`
+
+`path` is the path of the validator in the schema, `elapsed` the time the validation took in
+seconds and `error` the `SchemaError` or `SchemaErrors` exception describing the failure.
+
+The callbacks of `global_hooks` are called by `Schema.validate`, `Schema.avalidate`,
+`Schema.validate_many` and the helpers of `skame.validator` for the whole schema, with an empty
+path. The callbacks of any other registry are called for every validator of
+the schemas instrumented with its `instrument` method.
+"""
+from skame._hooks_state import HooksRegistry, global_hooks
+from skame.schemas.base import Schema, transform
+
+# `global_hooks` is defined apart so the schemas can call it without importing this module
+__all__ = ["Hooks", "Traced", "global_hooks"]
+
+
+class Hooks(HooksRegistry):
+    """Registry of validation callbacks.
+
+    The `on_start`, `on_success` and `on_error` methods register a callback and return it, so they
+    can be used as decorators. While no callback is registered `enabled` is False and nothing
+    is called around the validations.
+    """
+
+    def instrument(self, schema: Schema, name: str="") -> Schema:
+        """Return a copy of the schema that calls the callbacks around each of its validators.
+
+        `name` is the path of the root of the schema, and the prefix of the paths of the rest of
+        its validators.
+        """
+        return transform(schema, lambda node, path: Traced(node, path, self), name)
+
+
+class Traced(Schema):
+    """Validator that calls the callbacks of a `Hooks` registry around another validator."""
+    __slots__ = ("schema", "path", "hooks", "is_async", "accepts_fail_fast")
+
+    def __init__(self, schema: Schema, path: str, hooks: HooksRegistry):
+        self.schema = schema
+        self.path = path
+        self.hooks = hooks
+        self.is_async = schema.is_async
+        self.accepts_fail_fast = schema.accepts_fail_fast
+
+    def _accepts_type(self, cls: type) -> bool:
+        return self.schema._accepts_type(cls)
+
+    def children(self) -> list:
+        return self.schema.children()
+
+    def replace_children(self, children: list) -> "Traced":
+        return Traced(self.schema.replace_children(children), self.path, self.hooks)
+
+    def check(self, data: object, **kwargs) -> (object, Exception):
+        if not self.hooks.enabled:
+            return self.schema.check(data, **kwargs)
+        return self.hooks.check(self.schema, data, self.path, **kwargs)
+
+    async def acheck(self, data: object) -> (object, Exception):
+        if not self.hooks.enabled:
+            return await self.schema.acheck(data)
+        return await self.hooks.acheck(self.schema, data, self.path)
@@ -0,0 +1,51 @@
+"""Sharing of identical validators between schemas.
+
+Schemas built from the same definitions, like one schema per tenant, repeat the same validators
+as separate objects. `intern` replaces each validator of a schema by an equal validator seen
+before, so the schemas share a single copy of their common parts, and anything kept for them,
+like the results of `Cached` validators.
+
+Validators are equal when they have the same type and parameters, see `Schema._key`.
+"""
+from skame.schemas.base import Schema, transform
+
+
+class Registry:
+    """Registry of interned validators.
+
+    The validators are kept until the registry is cleared, so use a registry of your own for
+    schemas that are built and dropped over time.
+    """
+
+    def __init__(self):
+        self.schemas = {}
+
+    def intern(self, schema: Schema) -> Schema:
+        """Return a schema equal to the given one made of the validators in the registry,
+        adding the ones that are not in it yet."""
+        return transform(schema, self._intern)
+
+    def _intern(self, schema: Schema, path: str) -> Schema:
+        if schema._structural_hash() is None:
+            # validators compared by identity, like choices that are lists, can't be shared
+            return schema
+        return self.schemas.setdefault(schema, schema)
+
+    def clear(self):
+        self.schemas.clear()
+
+    def __len__(self):
+        return len(self.schemas)
+
+    def __contains__(self, schema: Schema) -> bool:
+        return schema in self.schemas
+
+
+default_registry = Registry()
+
+
+def intern(schema: Schema, registry: Registry=None) -> Schema:
+    """Intern a schema in a registry, the default registry if not given."""
+    if registry is None:
+        registry = default_registry
+    return registry.intern(schema)
@@ -0,0 +1,73 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+
+from skame.serialization import dumps, loads
+from skame.utils import import_object
+
+
+_worker_schema = None
+
+
+def _init_worker(schema: "bytes or str"):
+    global _worker_schema
+    _worker_schema = import_object(schema) if isinstance(schema, str) else loads(schema)
+
+
+def _validate_chunk(start: int, chunk: list, fail_fast: bool) -> list:
+    return [(start + index, cleaned, errors)
+            for index, cleaned, errors in _worker_schema.validate_many(chunk, fail_fast=fail_fast)]
+
+
+class ParallelValidator:
+    """Validate large sets of items in a pool of worker processes.
+
+    The items are split in chunks of `chunksize` items that are validated in `workers` processes
+    (the number of CPUs by default), and the results are yielded in the original order. Only a
+    few chunks per worker are in flight at any time, so iterables of any size can be validated.
+
+    The schema is serialized with `skame.serialization.dumps` and sent once to each worker when
+    it starts. Schemas that can't be serialized, like the ones holding lambdas, can be given by
+    their import path in the form `module:attribute`, so each worker imports its own copy.
+
+    The validator must be closed to shut the pool down, it can be used as a context manager.
+    """
+
+    def __init__(self, schema: "Schema or str", workers: int=None, chunksize: int=1000):
+        self.schema = schema
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(schema if isinstance(schema, str) else dumps(schema),))
+
+    def validate_many(self, iterable: "iterable", fail_fast: bool=False) -> "generator":
+        """Validate each item of an iterable, yielding `(index, cleaned, errors)` tuples in order.
+
+        See `Schema.validate_many`.
+        """
+        items = iter(iterable)
+        pending = collections.deque()
+        max_pending = self.workers * 2
+
+        for start in itertools.count(0, self.chunksize):
+            chunk = list(itertools.islice(items, self.chunksize))
+            if not chunk:
+                break
+            pending.append(self.executor.submit(_validate_chunk, start, chunk, fail_fast))
+
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
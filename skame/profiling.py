@@ -0,0 +1,150 @@
+"""Per-validator profiling of schemas.
+
+A `Profiler` instruments a copy of a schema, wrapping each validator of the tree in a `Profiled`
+validator that records how many times it's called, the time spent in it and how many times it
+fails. The statistics are keyed by the path of each validator in the tree, like
+`order.items.price`, so a slow field or nested validator can be told apart.
+
+The original schema is left untouched, only the instrumented copy pays for the measurements.
+"""
+import time
+
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.schemas.base import Schema, transform
+
+
+class NodeStats:
+    """Statistics of a validator of a profiled schema.
+
+    The times are in seconds and include the time spent in the children of the validator.
+    """
+    __slots__ = ("path", "schema", "calls", "total", "max", "failures")
+
+    def __init__(self, path: str, schema: Schema):
+        self.path = path
+        self.schema = schema
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+
+    def record(self, elapsed: float, failed: bool):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if failed:
+            self.failures += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        return {"path": self.path, "schema": type(self.schema).__name__, "calls": self.calls,
+                "total": self.total, "mean": self.mean, "max": self.max,
+                "failures": self.failures}
+
+    def __repr__(self):
+        return "<NodeStats {!r} calls={} total={:.6f}s failures={}>".format(
+            self.path, self.calls, self.total, self.failures)
+
+
+class Profiled(Schema):
+    """Validator that records the statistics of another validator in a `NodeStats`.
+
+    Nothing is recorded while the profiler is disabled.
+    """
+    __slots__ = ("schema", "stats", "profiler", "is_async", "accepts_fail_fast")
+
+    def __init__(self, schema: Schema, stats: NodeStats, profiler: "Profiler"):
+        self.schema = schema
+        self.stats = stats
+        self.profiler = profiler
+        self.is_async = schema.is_async
+        self.accepts_fail_fast = schema.accepts_fail_fast
+
+    def _accepts_type(self, cls: type) -> bool:
+        return self.schema._accepts_type(cls)
+
+    def children(self) -> list:
+        return self.schema.children()
+
+    def replace_children(self, children: list) -> "Profiled":
+        return Profiled(self.schema.replace_children(children), self.stats, self.profiler)
+
+    def check(self, data: object, **kwargs) -> (object, Exception):
+        if not self.profiler.enabled:
+            return self.schema.check(data, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            result = self.schema.check(data, **kwargs)
+        except (SchemaError, SchemaErrors):
+            self.stats.record(time.perf_counter() - start, True)
+            raise
+        self.stats.record(time.perf_counter() - start, result[1] is not None)
+        return result
+
+    async def acheck(self, data: object) -> (object, Exception):
+        if not self.profiler.enabled:
+            return await self.schema.acheck(data)
+
+        start = time.perf_counter()
+        try:
+            result = await self.schema.acheck(data)
+        except (SchemaError, SchemaErrors):
+            self.stats.record(time.perf_counter() - start, True)
+            raise
+        self.stats.record(time.perf_counter() - start, result[1] is not None)
+        return result
+
+
+class Profiler:
+    """Collect the statistics of the validators of instrumented schemas.
+
+    Validate with the schemas returned by `instrument` and get the statistics with `report` or
+    `format_report`. The profiler can be disabled to stop recording without rebuilding the
+    schemas.
+    """
+
+    def __init__(self, enabled: bool=True):
+        self.enabled = enabled
+        self.stats = {}
+
+    def instrument(self, schema: Schema, name: str="") -> Schema:
+        """Return a copy of the schema that records its statistics in this profiler.
+
+        `name` is the path of the root of the schema, and the prefix of the paths of the rest of
+        its validators.
+        """
+        return transform(schema, self._wrap, name)
+
+    def _wrap(self, schema: Schema, path: str) -> Profiled:
+        stats = self.stats.get(path)
+        if stats is None:
+            stats = self.stats[path] = NodeStats(path, schema)
+        return Profiled(schema, stats, self)
+
+    def report(self) -> list:
+        """Return the `NodeStats` of the validators that have been called, the slowest first."""
+        return sorted((stats for stats in self.stats.values() if stats.calls),
+                      key=lambda stats: (-stats.total, stats.path))
+
+    def format_report(self) -> str:
+        """Return the report as a text table."""
+        lines = ["{:<40} {:<12} {:>8} {:>12} {:>12} {:>12} {:>8}".format(
+            "path", "schema", "calls", "total (ms)", "mean (us)", "max (us)", "failures")]
+        for stats in self.report():
+            lines.append("{:<40} {:<12} {:>8} {:>12.3f} {:>12.3f} {:>12.3f} {:>8}".format(
+                stats.path or "<root>", type(stats.schema).__name__, stats.calls,
+                stats.total * 1e3, stats.mean * 1e6, stats.max * 1e6, stats.failures))
+        return "\n".join(lines)
+
+    def reset(self):
+        """Clear the recorded statistics."""
+        for stats in self.stats.values():
+            stats.reset()
@@ -1,12 +1,18 @@
+import asyncio
 import functools
 import types
+import collections
 import collections.abc
-from abc import abstractmethod, ABCMeta
+import sys
+from abc import ABCMeta
 
 from gettext import gettext as _
 
-from skame.exceptions import SchemaError, SchemaErrors
-from skame.utils import compose
+from skame._hooks_state import global_hooks
+from skame.arrays import (ArrayResult, all_results, as_array, is_array, numpy, result_errors,
+                          take)
+from skame.exceptions import SchemaError, SchemaErrors, render_error
+from skame.utils import LazyJoin
 
 
 class Optional:
@@ -57,6 +63,25 @@ def is_field_dependent(field: object) -> bool:
     return isinstance(field, Dependent)
 
 
+REQUIRED = "required"
+OPTIONAL = "optional"
+DEPENDENT = "dependent"
+
+FieldPlan = collections.namedtuple("FieldPlan", ("key", "lookup", "schema", "kind", "message"))
+FieldPlan.__doc__ = """Precomputed validation step of a `Map` field.
+
+`key` is the name of the field in the cleaned data, `lookup` the key used to read its value from
+the data, `kind` one of `REQUIRED`, `OPTIONAL` or `DEPENDENT` and `message` the error reported
+when the field is missing.
+"""
+
+# shared by the maps without fields of some kind
+_NO_FIELDS = frozenset()
+
+# shared by the `Or` validators that dispatch by type until they see their first value
+_NO_DISPATCH = types.MappingProxyType({})
+
+
 @functools.singledispatch
 def schema(definition: "callable", message: str=None) -> "Pipe":
     return Pipe(definition, message=message)
@@ -72,17 +97,288 @@ def schema_map(definition: dict, messages: dict=None) -> "Map":
     return Map(definition, messages=messages)
 
 
+class _Identity:
+    """Wrapper of an object that is only equal to the wrappers of the same object."""
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: object):
+        self.obj = obj
+
+    def __eq__(self, other):
+        return type(other) is _Identity and self.obj is other.obj
+
+    def __hash__(self):
+        return id(self.obj)
+
+
 class Schema(metaclass=ABCMeta):
-    """Abstract base class for creating schema validators."""
+    """Abstract base class for creating schema validators.
+
+    Subclasses must implement at least one of `validate` or `check`, each one is implemented by
+    default on top of the other. Subclasses of the built-in validators that only override
+    `validate` are checked through it too.
+
+    Validators that need to await something to validate data set `is_async` and implement
+    `acheck`, they can only be validated with `avalidate`.
+
+    Validators that can stop at the first error when validating multiple values set
+    `accepts_fail_fast` and take a `fail_fast` argument in `check`, it is only given when set.
+
+    Validators made of other validators implement `children` and `replace_children`, so schema
+    trees can be walked and rebuilt with `transform`.
+
+    The built-in validators declare `__slots__` to keep large schemas small, their default
+    messages are class attributes (`default_message`) shared by all the instances. Subclasses
+    setting `message` (or `regex`, `schemes`...) as a class attribute set its default.
+
+    Validators that implement `_key` are compared and hashed by their type and parameters, so
+    identical validators are equal and can be shared with `skame.interning.intern`. The rest are
+    only equal to themselves. The hash of a validator is computed once, so its parameters must not
+    change once it's hashed.
+    """
+    __slots__ = ("_hash",)
+    is_async = False
+    accepts_fail_fast = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # subclasses can still customize the defaults by setting the attribute itself, like
+        # `message` or `regex`, which would hide the slot of the instances otherwise
+        for name, value in list(cls.__dict__.items()):
+            default = "default_" + name
+            if not name.startswith("_") and default not in cls.__dict__ and hasattr(cls, default):
+                if isinstance(value, dict):
+                    # shared by all the instances, so they can't change it
+                    value = types.MappingProxyType(value)
+                setattr(cls, default, value)
+                delattr(cls, name)
+
+        if "check" in cls.__dict__:
+            cls._base_check = cls.__dict__["check"]
+        elif "validate" in cls.__dict__ and cls.check is not Schema.check:
+            # subclasses of validators that only override `validate` are checked through it, so
+            # validators made of them (and their shortcuts) don't skip the override
+            cls.check = Schema.check
+            for name in ("validate_array", "validate_column", "_accepts_type"):
+                if name not in cls.__dict__:
+                    setattr(cls, name, getattr(Schema, name))
+            if "accepts_fail_fast" not in cls.__dict__:
+                cls.accepts_fail_fast = False
+        cls._abstract = cls.check is Schema.check and cls.validate is Schema.validate
+
+    def __new__(cls, *args, **kwargs):
+        if cls._abstract:
+            raise TypeError("Can't instantiate abstract class {} without `validate` or `check`"
+                            .format(cls.__name__))
+        return super().__new__(cls)
+
+    def __getstate__(self):
+        # the values of the slots, but the ones shadowed by subclasses, like the `predicate` slot
+        # of `Predicate` by the `predicate` method of `Type`
+        cls = type(self)
+        slots = {}
+        for klass in cls.__mro__:
+            for name in klass.__dict__.get("__slots__", ()):
+                if name == "_hash":
+                    # hashes of functions and types are not the same in other processes
+                    continue
+                if getattr(cls, name) is klass.__dict__[name] and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return getattr(self, "__dict__", None), slots
+
+    def _key(self) -> tuple:
+        """Return the parameters of the validator, or None to compare it by identity."""
+        return None
+
+    def _structure(self) -> tuple:
+        key = self._key()
+        if key is None:
+            return None
+        # attributes added by subclasses without slots are parameters too
+        extra = getattr(self, "__dict__", None)
+        if extra:
+            return type(self), key, tuple(sorted(extra.items()))
+        return type(self), key
+
+    def _structural_hash(self) -> int:
+        """Return the hash of the structure of the validator, or None to compare it by identity.
+
+        It's computed once, so the hashes of the children of the validator are not computed again
+        for each of its ancestors.
+        """
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        structure = self._structure()
+        try:
+            self._hash = None if structure is None else hash(structure)
+        except TypeError:
+            # validators with unhashable parameters, like choices that are lists, are compared
+            # by identity
+            self._hash = None
+        return self._hash
 
-    @abstractmethod
-    def validate(self, data: object) -> object:
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return NotImplemented
+        structural_hash = self._structural_hash()
+        if structural_hash is None or structural_hash != other._structural_hash():
+            return False
+        return self._structure() == other._structure()
+
+    def __hash__(self):
+        structural_hash = self._structural_hash()
+        if structural_hash is None:
+            return object.__hash__(self)
+        return structural_hash
+
+    def validate(self, data: object, fail_fast: bool=False) -> object:
         """Validate the received data and return it sanitazed.
 
         If the data is not valid a `SchemaError` or `SchemaErrors` exception is raised depending on
-        if the validation occurs on one or multiple values.
+        if the validation occurs on one or multiple values. With `fail_fast` the validation stops
+        at the first error, so only that error is reported.
+        """
+        if global_hooks.enabled:
+            if fail_fast and self.accepts_fail_fast:
+                cleaned, error = global_hooks.check(self, data, fail_fast=True)
+            else:
+                cleaned, error = global_hooks.check(self, data)
+        elif fail_fast and self.accepts_fail_fast:
+            cleaned, error = self._base_check(data, fail_fast=True)
+        else:
+            cleaned, error = self._base_check(data)
+        if error is not None:
+            raise error
+        return cleaned
+
+    def check(self, data: object, fail_fast: bool=False) -> (object, Exception):
+        """Validate the received data without raising validation errors.
+
+        It returns a tuple with the sanitazed data and None if the data is valid, or None and the
+        `SchemaError` or `SchemaErrors` exception describing the failure (without raising it)
+        otherwise.
+        """
+        if type(self).validate is Schema.validate:
+            raise NotImplementedError("{} must implement `validate` or `check`".format(
+                type(self).__name__))
+        try:
+            if fail_fast:
+                return self.validate(data, fail_fast=True), None
+            return self.validate(data), None
+        except (SchemaError, SchemaErrors) as e:
+            return None, e
+
+    # the `check` of the validator itself, called by `validate` even when `check` goes through an
+    # overridden `validate`
+    _base_check = check
+    _abstract = True
+
+    def _accepts_type(self, cls: type) -> bool:
+        """Tell if the validator accepts every value of a type (True), none of them (False) or it
+        depends on the value (None), letting `Or` skip the conditions that can't succeed."""
+        return None
+
+    def children(self) -> list:
+        """Return the validators this one is made of, as `(label, validator)` pairs.
+
+        The label is the suffix of the path of the child in the schema tree: `.name` for fields
+        and `[key]` for the rest of children.
+        """
+        return []
+
+    def replace_children(self, children: list) -> "Schema":
+        """Return a copy of the validator made of other children, given in the order of `children`."""
+        return self
+
+    async def avalidate(self, data: object) -> object:
+        """Asynchronous version of `validate`."""
+        if global_hooks.enabled:
+            cleaned, error = await global_hooks.acheck(self, data)
+        else:
+            cleaned, error = await self.acheck(data)
+        if error is not None:
+            raise error
+        return cleaned
+
+    async def acheck(self, data: object) -> (object, Exception):
+        """Asynchronous version of `check`."""
+        return self.check(data)
+
+    def validate_many(self, iterable: "iterable", fail_fast: bool=False) -> "generator":
+        """Validate each item of an iterable, yielding `(index, cleaned, errors)` tuples.
+
+        `errors` is None for valid items. For invalid items `cleaned` is None and `errors` holds the
+        error message or the errors dict of the item, only its first error with `fail_fast`.
         """
-        pass
+        if global_hooks.enabled:
+            check = functools.partial(global_hooks.check, self)
+        else:
+            check = self.check
+        if fail_fast and self.accepts_fail_fast:
+            check = functools.partial(check, fail_fast=True)
+
+        for index, data in enumerate(iterable):
+            try:
+                cleaned, error = check(data)
+            except (SchemaError, SchemaErrors) as e:
+                cleaned, error = None, e
+
+            if error is None:
+                yield index, cleaned, None
+            else:
+                yield index, None, render_error(error)
+
+    def validate_array(self, array: "numpy.ndarray") -> ArrayResult:
+        """Validate every item of a NumPy array, returning an `ArrayResult`.
+
+        Validators with a vectorized implementation validate the whole array at once, the rest
+        check the items one by one. NumPy must be installed.
+        """
+        array = as_array(array)
+        mask = numpy.ones(array.shape, dtype=bool)
+        errors = []
+
+        for index, data in enumerate(array.flat):
+            try:
+                _, error = self.check(data)
+            except (SchemaError, SchemaErrors) as e:
+                error = e
+            if error is not None:
+                mask.flat[index] = False
+                errors.append(error)
+
+        messages = numpy.empty(len(errors), dtype=object)
+        for position, error in enumerate(errors):
+            messages[position] = render_error(error)
+
+        return ArrayResult(mask, numpy.flatnonzero(~mask), messages)
+
+    def validate_column(self, values: "sequence") -> ("sequence", dict):
+        """Validate all the values of a column, a list or NumPy array.
+
+        It returns a tuple with the column of cleaned values and a dict of the index of each
+        invalid value to its error message. The cleaned values at invalid positions are undefined.
+        Validators with a fast path validate the whole column at once, the rest check the values
+        one by one.
+        """
+        check = self.check
+        cleaned = []
+        errors = {}
+
+        for index, data in enumerate(values):
+            try:
+                value, error = check(data)
+            except (SchemaError, SchemaErrors) as e:
+                value, error = None, e
+            cleaned.append(value)
+            if error is not None:
+                errors[index] = render_error(error)
+
+        return cleaned, errors
 
 
 class Predicate(Schema):
@@ -92,174 +388,839 @@ class Predicate(Schema):
     This is concrete case of predicate that accept a callable
     as a parameter.
     """
-    message = _("`{predicate}({data})` should evaluate to True")
+    __slots__ = ("predicate", "message")
+    default_message = _("`{predicate}({data})` should evaluate to True")
 
     def __init__(self, predicate: "callable", message: str=None):
         self.predicate = predicate
-        if message:
-            self.message = message
+        self.message = message or self.default_message
+
+    def _key(self) -> tuple:
+        return self.predicate, self.message
 
-    def validate(self, data: object) -> object:
+    def check(self, data: object) -> (object, Exception):
         if not self.predicate(data):
-            raise SchemaError(self.get_message(data))
-        return data
+            return None, self.get_error(data)
+        return data, None
+
+    def validate_column(self, values: "sequence") -> ("sequence", dict):
+        predicate = self.predicate
+        errors = {index: self.get_error(data).error
+                  for index, data in enumerate(values) if not predicate(data)}
+        return values, errors
+
+    def get_error(self, data) -> SchemaError:
+        """Build the error for a rejected value, its message is formatted only when accessed."""
+        if type(self).get_message is not Predicate.get_message:
+            return SchemaError(self.get_message(data))
+        return SchemaError(self.message, params=self.get_params(data))
 
     def get_message(self, data):
-        return self.message.format(predicate=self.predicate, data=data)
+        return self.message.format(**self.get_params(data))
+
+    def get_params(self, data):
+        return {"predicate": self.predicate, "data": data}
+
+
+def _checks_like(schema: Schema, schema_class: type) -> bool:
+    """Check if a validator checks its values exactly like one of the predicate classes."""
+    kind = type(schema)
+    return kind.check is Predicate.check and kind.predicate is schema_class.predicate
+
+
+# types with a single instance, so their type tells which value they are
+_SINGLETON_TYPES = (type(None), type(NotImplemented), type(Ellipsis))
 
 
 class Type(Predicate):
     """Validator for checking the type of a value."""
-    message = _("Not of type `{type}`")
+    __slots__ = ("type",)
+    default_message = _("Not of type `{type}`")
 
     def __init__(self, type, message=None):
-        super().__init__(lambda data: isinstance(data, type), message)
         self.type = type
+        self.message = message or self.default_message
 
-    def get_message(self, data):
-        return self.message.format(type=self.type)
+    def _key(self) -> tuple:
+        return self.type, self.message
+
+    def predicate(self, data):
+        return isinstance(data, self.type)
+
+    def get_params(self, data):
+        return {"type": self.type}
+
+    def _accepts_type(self, cls: type) -> bool:
+        # metaclasses and the classes that override `__class__`, like proxies and mocks, can make
+        # `isinstance` depend on the value
+        if type(self.type) is not type or not _checks_like(self, Type):
+            return None
+        if any("__class__" in klass.__dict__ for klass in cls.__mro__[:-1]):
+            return None
+        return issubclass(cls, self.type)
 
 
 class StrictType(Predicate):
     """Validator for strictly checking the type of a value."""
-    message = _("Not of strict type `{type}`")
+    __slots__ = ("type",)
+    default_message = _("Not of strict type `{type}`")
 
     def __init__(self, atype, message=None):
-        super().__init__(lambda data: type(data) is atype, message)
         self.type = atype
+        self.message = message or self.default_message
 
-    def get_message(self, data):
-        return self.message.format(type=self.type)
+    def _key(self) -> tuple:
+        return self.type, self.message
+
+    def predicate(self, data):
+        return type(data) is self.type
+
+    def get_params(self, data):
+        return {"type": self.type}
+
+    def _accepts_type(self, cls: type) -> bool:
+        if not _checks_like(self, StrictType):
+            return None
+        return cls is self.type
 
 
 class Is(Predicate):
     """Validator for checking the identity of a value."""
-    message = _("Is not `{obj}`")
+    __slots__ = ("obj",)
+    default_message = _("Is not `{obj}`")
 
     def __init__(self, obj: object, message=None):
-        super().__init__(lambda data: data is obj, message)
         self.obj = obj
+        self.message = message or self.default_message
 
-    def get_message(self, data):
-        return self.message.format(obj=self.obj)
+    def _key(self) -> tuple:
+        # the same object, not an equal one
+        return _Identity(self.obj), self.message
+
+    def predicate(self, data):
+        return data is self.obj
+
+    def get_params(self, data):
+        return {"obj": self.obj}
+
+    def _accepts_type(self, cls: type) -> bool:
+        if not _checks_like(self, Is):
+            return None
+        if cls is not type(self.obj):
+            return False
+        return True if cls in _SINGLETON_TYPES else None
+
+
+class AsyncPredicate(Predicate):
+    """Validator for checking if an asynchronous predicate accepts a value.
+
+    The predicate is a coroutine function, so the validator can only be used with `avalidate`.
+    """
+    __slots__ = ()
+    is_async = True
+
+    def check(self, data: object) -> (object, Exception):
+        raise TypeError("{} can only be validated with `avalidate`".format(type(self).__name__))
+
+    validate_column = Schema.validate_column
+
+    async def acheck(self, data: object) -> (object, Exception):
+        if not await self.predicate(data):
+            return None, self.get_error(data)
+        return data, None
 
 
 class Pipe(Schema):
-    """Validator that tries to convert a value into another value."""
+    """Validator that tries to convert a value into another value.
 
-    message = None
+    The value travels through the pipes in order. The exceptions in `watch_for_exceptions` raised
+    by the pipes are reported as validation errors, the rest are propagated.
+    """
+    __slots__ = ("message", "pipes", "watch_for_exceptions")
+    default_watch_for_exceptions = (ValueError, TypeError)
 
-    def __init__(self, pipe: "callable", *extra_pipes, message: str=None):
+    def __init__(self, pipe: "callable", *extra_pipes, message: str=None,
+                 watch_for_exceptions: Exception=None):
         self.message = message
+        self.pipes = (pipe,) + extra_pipes
+        self.watch_for_exceptions = watch_for_exceptions or self.default_watch_for_exceptions
 
-        if extra_pipes:
-            pipes = reversed((pipe,) + extra_pipes)
-            self.pipe = compose(*pipes)
-        else:
-            self.pipe = pipe
+    def _key(self) -> tuple:
+        return self.pipes, self.message, self.watch_for_exceptions
+
+    def pipe(self, data: object) -> object:
+        for pipe in self.pipes:
+            data = pipe(data)
+        return data
+
+    def validate(self, data: object, watch_for_exceptions: Exception=None,
+                 fail_fast: bool=False) -> object:
+        """Validate the data, watching for the given exceptions instead of the validator ones."""
+        if watch_for_exceptions is None:
+            return super().validate(data)
+        cleaned, error = self._check(data, watch_for_exceptions)
+        if error is not None:
+            raise error
+        return cleaned
 
-    def validate(self, data: object,
-                 watch_for_exceptions: Exception=(ValueError, TypeError)) -> object:
+    def check(self, data: object) -> (object, Exception):
+        return self._check(data, self.watch_for_exceptions)
+
+    def _check(self, data: object, watch_for_exceptions: Exception) -> (object, Exception):
         try:
-            return self.pipe(data)
+            for pipe in self.pipes:
+                data = pipe(data)
+            return data, None
         except watch_for_exceptions as e:
-            message = str(e)
-            raise SchemaError(self.message or message)
+            if self.message:
+                return None, SchemaError(self.message)
+            return None, SchemaError("{error}", params={"error": e})
 
 
 class And(Schema):
-    """Validator to combine another validators and only succeeds if all succeed."""
+    """Validator to combine another validators and only succeeds if all succeed.
+
+    Nested `And` validators are flattened into one chain of conditions at construction.
+    """
+    __slots__ = ("conditions", "is_async")
 
     def __init__(self, condition1: "Schema", *extra_conditions):
-        self.conditions = list(reversed((condition1,) + extra_conditions))
+        self.conditions = []
+        for condition in (condition1,) + extra_conditions:
+            if type(condition) is And:
+                self.conditions.extend(condition.conditions)
+            else:
+                self.conditions.append(condition)
+        self.is_async = any(condition.is_async for condition in self.conditions)
 
-    def validate(self, data: object) -> object:
-        validator = compose(*[condition.validate for condition in self.conditions])
-        return validator(data)
+    accepts_fail_fast = True
 
+    def children(self) -> list:
+        return [("[{}]".format(index), condition) for index, condition in enumerate(self.conditions)]
 
-class Or(Schema):
-    """Validator to combine another validators and succeeds if any of them succeed."""
-    message = _("All conditions failed: {messages}")
+    def replace_children(self, children: list) -> "And":
+        return And(*children)
+
+    def _key(self) -> tuple:
+        return tuple(self.conditions)
+
+    def check(self, data: object, fail_fast: bool=False) -> (object, Exception):
+        for condition in self.conditions:
+            if fail_fast and condition.accepts_fail_fast:
+                data, error = condition.check(data, fail_fast=True)
+            else:
+                data, error = condition.check(data)
+            if error is not None:
+                return None, error
+        return data, None
+
+    def _accepts_type(self, cls: type) -> bool:
+        # only the conditions that don't change the value give an answer, so the answer of each
+        # condition is about the same value
+        for condition in self.conditions:
+            accepts = condition._accepts_type(cls)
+            if not accepts:
+                return accepts
+        return True
+
+    async def acheck(self, data: object) -> (object, Exception):
+        for condition in self.conditions:
+            if condition.is_async:
+                data, error = await condition.acheck(data)
+            else:
+                data, error = condition.check(data)
+            if error is not None:
+                return None, error
+        return data, None
+
+    def _vectorized(self) -> bool:
+        return all(type(condition).validate_array is not Schema.validate_array
+                   for condition in self.conditions)
+
+    def validate_array(self, array: "numpy.ndarray") -> ArrayResult:
+        # conditions with a vectorized implementation don't transform the data, so the array is
+        # validated against each one and their masks are combined
+        if self._vectorized():
+            return all_results(array, self.conditions)
+        return super().validate_array(array)
+
+    def validate_column(self, values: "sequence") -> ("sequence", dict):
+        if is_array(values) and self._vectorized():
+            return values, result_errors(self.validate_array(values))
+
+        # each condition validates the values that passed the previous conditions
+        positions = range(len(values))
+        errors = {}
+
+        for condition in self.conditions:
+            values, condition_errors = condition.validate_column(values)
+            if condition_errors:
+                valid = [position for position in range(len(values))
+                         if position not in condition_errors]
+                for position, error in condition_errors.items():
+                    errors[positions[position]] = error
+                positions = [positions[position] for position in valid]
+                values = take(values, valid)
+
+        if not errors:
+            return values, errors
 
-    def __init__(self, condition1: "Schema", *extra_conditions, message=None):
-        self.conditions = list(reversed((condition1,) + extra_conditions))
+        cleaned = [None] * (len(values) + len(errors))
+        for position, value in zip(positions, values):
+            cleaned[position] = value
+        return cleaned, errors
 
-        if message:
-            self.message = message
 
-    def validate(self, data: object) -> object:
+class Or(Schema):
+    """Validator to combine another validators and succeeds if any of them succeed.
+
+    Nested `Or` validators without a custom message are flattened into one list of conditions at
+    construction, so their messages are reported together with the rest of conditions.
+
+    When some conditions check the type or the identity of the value (`Type`, `StrictType` or
+    `Is`), the conditions that can succeed for each type of value are kept in a dispatch table
+    the first time a type is seen, so the rest of conditions are not tried.
+
+    With `adaptive` the conditions are tried in the order of their number of successes (`hits`),
+    updated every `reorder_every` validations, and the first condition that accepts the value is
+    the result. That's only the result of the usual order when the conditions are `exclusive`, that
+    is, they never accept the same value, so `adaptive` requires `exclusive`. The conditions of
+    multiple values (`Map`, `Tagged`...) that come before the accepting one in the usual order are
+    still checked, as their errors are the result in the usual order. The counters and tables of
+    adaptive validators are only created with `adaptive`.
+    """
+    __slots__ = ("conditions", "is_async", "dispatch", "message", "adaptive", "exclusive",
+                 "reorder_every", "calls", "hits", "order", "positions")
+    default_message = _("All conditions failed: {messages}")
+    accepts_fail_fast = True
+
+    def __init__(self, condition1: "Schema", *extra_conditions, message=None,
+                 adaptive: bool=False, exclusive: bool=False, reorder_every: int=1000):
+        self.conditions = []
+        for condition in reversed((condition1,) + extra_conditions):
+            if (type(condition) is Or and condition.message == Or.default_message and
+                    not condition.adaptive):
+                self.conditions.extend(condition.conditions)
+            else:
+                self.conditions.append(condition)
+        self.is_async = any(condition.is_async for condition in self.conditions)
+        self.dispatch = (_NO_DISPATCH
+                         if any(type(condition)._accepts_type is not Schema._accepts_type
+                                for condition in self.conditions) else None)
+        self.message = message or self.default_message
+
+        if adaptive and not exclusive:
+            raise ValueError("Adaptive `Or` validators require exclusive conditions")
+        if reorder_every <= 0:
+            raise ValueError("`reorder_every` must be a positive number of validations")
+        self.adaptive = adaptive
+        self.exclusive = exclusive
+        self.reorder_every = reorder_every
+        if adaptive:
+            self.calls = 0
+            self.hits = [0] * len(self.conditions)
+            self.order = tuple(range(len(self.conditions)))
+            self.positions = {}
+        else:
+            self.calls = self.hits = self.order = self.positions = None
+
+    def __getstate__(self):
+        # the dispatch tables are rebuilt on demand
+        state, slots = super().__getstate__()
+        if self.dispatch is not None:
+            slots["dispatch"] = {}
+        if self.adaptive:
+            slots["positions"] = {}
+        return state, slots
+
+    def children(self) -> list:
+        # in declaration order, the reverse of the order of the conditions
+        return [("[{}]".format(index), condition)
+                for index, condition in enumerate(reversed(self.conditions))]
+
+    def replace_children(self, children: list) -> "Or":
+        return Or(*children, message=self.message, adaptive=self.adaptive,
+                  exclusive=self.exclusive, reorder_every=self.reorder_every)
+
+    def _key(self) -> tuple:
+        # the counters of adaptive validators are state, not parameters
+        return (tuple(self.conditions), self.message, self.adaptive, self.exclusive,
+                self.reorder_every)
+
+    def candidates(self, cls: type) -> tuple:
+        """Return the conditions that can succeed for a value of the given type, in order."""
+        candidates = []
+        for condition in self.conditions:
+            accepts = condition._accepts_type(cls)
+            if accepts is not False:
+                candidates.append(condition)
+            if accepts:
+                # this condition accepts the value, the next ones are never tried
+                break
+        return tuple(candidates)
+
+    def reorder(self):
+        """Sort the conditions by their number of successes, ties keep the usual order."""
+        hits = self.hits
+        self.order = tuple(sorted(range(len(self.conditions)), key=lambda index: -hits[index]))
+
+    def _positions(self, cls: type) -> frozenset:
+        # positions of the conditions that can succeed for the type, None if all of them can
+        try:
+            return self.positions[cls]
+        except KeyError:
+            pass
+        if self.dispatch is None:
+            positions = None
+        else:
+            candidates = self.candidates(cls)
+            positions = frozenset(index for index, condition in enumerate(self.conditions)
+                                  if any(condition is candidate for candidate in candidates))
+        self.positions[cls] = positions
+        return positions
+
+    def _check_adaptive(self, data: object, fail_fast: bool) -> (object, Exception):
+        self.calls += 1
+        if self.calls % self.reorder_every == 0:
+            self.reorder()
+
+        conditions = self.conditions
+        positions = self._positions(type(data))
+        results = {}
+
+        for index in self.order:
+            if positions is not None and index not in positions:
+                continue
+            condition = conditions[index]
+            try:
+                if fail_fast and condition.accepts_fail_fast:
+                    result = condition.check(data, fail_fast=True)
+                else:
+                    result = condition.check(data)
+            except SchemaError as err:
+                result = None, err
+            except Exception as err:
+                # raised when the condition is reached in the usual order
+                results[index] = err
+                continue
+
+            if result[1] is None:
+                # the conditions are exclusive, so no other condition accepts the value, but the
+                # previous conditions in the usual order can still reject it with their own errors
+                previous = self._previous_result(data, index, positions, results, fail_fast)
+                if previous is not None:
+                    return previous
+                self.hits[index] += 1
+                return result
+            results[index] = result
+
+        # report the errors like the conditions were tried in the usual order
+        messages = []
+        for index, condition in enumerate(conditions):
+            try:
+                result = results[index]
+            except KeyError:
+                # the conditions skipped by type only check types and identities
+                result = condition.check(data)
+            if isinstance(result, Exception):
+                raise result
+            error = result[1]
+            if error is None:
+                return result
+            if isinstance(error, SchemaErrors):
+                return None, error
+            messages.append(error)
+
+        return None, SchemaError(self.message, params={"messages": LazyJoin(messages, render_error)})
+
+    def _previous_result(self, data: object, index: int, positions: frozenset, results: dict,
+                         fail_fast: bool) -> (object, Exception):
+        # the result in the usual order when it's not the one of the condition at `index`: the
+        # errors of multiple values (or the exception raised) by a previous condition
+        for previous, condition in enumerate(self.conditions[:index]):
+            if previous in results:
+                result = results[previous]
+            elif condition.accepts_fail_fast and (positions is None or previous in positions):
+                try:
+                    if fail_fast:
+                        result = condition.check(data, fail_fast=True)
+                    else:
+                        result = condition.check(data)
+                except SchemaError:
+                    continue
+            else:
+                continue
+            if isinstance(result, Exception):
+                raise result
+            if result[1] is None or isinstance(result[1], SchemaErrors):
+                return result
+        return None
+
+    def check(self, data: object, fail_fast: bool=False) -> (object, Exception):
+        if self.adaptive:
+            return self._check_adaptive(data, fail_fast)
+        if self.dispatch is None:
+            conditions = self.conditions
+        else:
+            try:
+                conditions = self.dispatch[type(data)]
+            except KeyError:
+                if self.dispatch is _NO_DISPATCH:
+                    self.dispatch = {}
+                conditions = self.dispatch[type(data)] = self.candidates(type(data))
+        messages = []
+
+        for condition in conditions:
+            try:
+                if fail_fast and condition.accepts_fail_fast:
+                    cleaned, error = condition.check(data, fail_fast=True)
+                else:
+                    cleaned, error = condition.check(data)
+            except SchemaError as err:
+                error = err
+
+            if error is None:
+                return cleaned, None
+            if isinstance(error, SchemaErrors):
+                return None, error
+            messages.append(error)
+
+        if len(messages) < len(self.conditions):
+            # the skipped conditions only check types and identities, so they are cheap to check
+            # again for their errors
+            tried = iter(messages)
+            messages = []
+            for condition in self.conditions:
+                if any(condition is tried_condition for tried_condition in conditions):
+                    messages.append(next(tried))
+                    continue
+                cleaned, error = condition.check(data)
+                if error is None:
+                    return cleaned, None
+                messages.append(error)
+
+        return None, SchemaError(self.message, params={"messages": LazyJoin(messages, render_error)})
+
+    async def acheck(self, data: object) -> (object, Exception):
         messages = []
 
         for condition in self.conditions:
             try:
-                return condition.validate(data)
+                if condition.is_async:
+                    cleaned, error = await condition.acheck(data)
+                else:
+                    cleaned, error = condition.check(data)
             except SchemaError as err:
-                messages.append(err.error)
+                error = err
+
+            if error is None:
+                return cleaned, None
+            if isinstance(error, SchemaErrors):
+                return None, error
+            messages.append(error)
 
-        message = self.message.format(messages=", ".join(messages))
-        raise SchemaError(message)
+        return None, SchemaError(self.message, params={"messages": LazyJoin(messages, render_error)})
 
 
 class Map(Schema):
-    """Validator that validates a map of field names to validators."""
+    """Validator that validates a map of field names to validators.
+
+    The fields are arranged at construction in a `plan`: a tuple of `FieldPlan` with the required
+    and optional fields in declaration order followed by the dependent fields.
+
+    With `fail_fast` the validation stops at the first invalid field, nested validators are
+    asked to stop at their first error too.
+
+    When validating with `avalidate` the asynchronous validators of the fields run concurrently,
+    `concurrency` limits how many of them run at once.
+    """
+    __slots__ = ("required", "optional", "dependent", "mapping", "plan", "concurrency", "is_async",
+                 "messages")
+    default_messages = types.MappingProxyType({
+        'required': _("Field `{0}` is required.")
+    })
 
-    def __init__(self, mapping: dict, messages=None):
+    def __init__(self, mapping: dict, messages=None, concurrency: int=None):
         required = set()
         optional = set()
         dependent = set()
 
-        self.messages = {
-            'required': _("Field `{0}` is required.")
-        }
+        # the default messages are shared (read-only) by all the instances without custom messages
+        self.messages = dict(self.default_messages, **messages) if messages else self.default_messages
 
-        if messages:
-            self.messages.update(messages)
+        plan = []
+        dependent_plan = []
 
         for field in mapping:
             if is_field_optional(field):
                 dest = optional
+                kind, lookup = OPTIONAL, field.name
             elif is_field_dependent(field):
                 dest = dependent
+                kind, lookup = DEPENDENT, field.name
             else:
                 dest = required
+                kind, lookup = REQUIRED, field
             dest.add(field)
 
-        self.required = required
-        self.optional = optional
-        self.dependent = dependent
+            # the messages are interned, as maps built from the same definition repeat them
+            step = FieldPlan(str(field), lookup, mapping[field], kind,
+                             sys.intern(self.messages['required'].format(field)))
+            (dependent_plan if kind is DEPENDENT else plan).append(step)
+
+        self.required = frozenset(required) if required else _NO_FIELDS
+        self.optional = frozenset(optional) if optional else _NO_FIELDS
+        self.dependent = frozenset(dependent) if dependent else _NO_FIELDS
         self.mapping = mapping
+        self.plan = tuple(plan + dependent_plan)
+        self.concurrency = concurrency
+        self.is_async = any(field.schema.is_async for field in self.plan)
+
+    def __reduce__(self):
+        # the field plan is rebuilt from the mapping when unpickling, the default messages are
+        # shared again
+        messages = None if self.messages is self.default_messages else self.messages
+        return type(self), (self.mapping, messages, self.concurrency)
+
+    def children(self) -> list:
+        return [(".{}".format(field), schema) for field, schema in self.mapping.items()]
+
+    def replace_children(self, children: list) -> "Map":
+        return Map(dict(zip(self.mapping, children)), self.messages, self.concurrency)
+
+    def _key(self) -> tuple:
+        # optional and dependent fields are equal to the required fields of the same name
+        fields = tuple((type(field), str(field), schema) for field, schema in self.mapping.items())
+        return fields, tuple(sorted(self.messages.items())), self.concurrency
 
-    def _validate(self, data: dict, fields: dict, value_getter: "function") -> dict:
+    accepts_fail_fast = True
+
+    def check(self, data: dict, fail_fast: bool=False) -> (dict, Exception):
+        keys = data.keys()
         errors = {}
         result = {}
+        dependents = False
+
+        for key, lookup, schema, kind, message in self.plan:
+            if kind is OPTIONAL and lookup not in keys:
+                continue
+            if kind is DEPENDENT and not dependents:
+                # dependent fields are only validated when the rest of fields are valid, so it's
+                # checked before the first of them
+                if errors:
+                    break
+                dependents = True
 
-        for field in fields:
             try:
-                value = value_getter(data, field)
-                cleaned_value = self.mapping[field].validate(value)
+                value = data if kind is DEPENDENT else data[lookup]
+                if fail_fast and schema.accepts_fail_fast:
+                    cleaned, error = schema.check(value, fail_fast=True)
+                else:
+                    cleaned, error = schema.check(value)
             except KeyError:
-                errors[str(field)] = self.messages['required'].format(field)
-            except SchemaError as e:
-                errors[str(field)] = e.error
-            except SchemaErrors as e:
-                errors[str(field)] = e.errors
+                error = message
+            except (SchemaError, SchemaErrors) as e:
+                error = e
+
+            if error is None:
+                result[key] = cleaned
             else:
-                result[str(field)] = cleaned_value
+                errors[key] = error
+                if fail_fast:
+                    break
 
         if errors:
-            raise SchemaErrors(errors)
+            return None, SchemaErrors(errors)
+
+        return result, None
+
+    async def acheck(self, data: dict) -> (dict, Exception):
+        if not self.is_async:
+            return self.check(data)
+
+        keys = data.keys()
+        errors = {}
+        result = {}
+        semaphore = asyncio.Semaphore(self.concurrency) if self.concurrency else None
+        stages = ([field for field in self.plan if field.kind is not DEPENDENT],
+                  [field for field in self.plan if field.kind is DEPENDENT])
 
-        return result
+        for stage in stages:
+            if errors:
+                # dependent fields are only validated when the rest of fields are valid
+                break
 
-    def validate(self, data: dict) -> dict:
-        # normal fields validation
-        fields = self.required | self.optional & set(data.keys())
+            fields = [field for field in stage if field.kind is not OPTIONAL or field.lookup in keys]
+            outcomes = await asyncio.gather(*[self._acheck_field(field, data, semaphore)
+                                              for field in fields])
 
-        result = self._validate(data, fields, dict.__getitem__)
+            for field, (cleaned, error) in zip(fields, outcomes):
+                if error is None:
+                    result[field.key] = cleaned
+                else:
+                    errors[field.key] = error
 
-        # dependent fields validation
-        fields = self.dependent
-        result.update(self._validate(data, fields, lambda data, field: data))
+        if errors:
+            return None, SchemaErrors(errors)
 
-        return result
+        return result, None
+
+    @staticmethod
+    async def _acheck_field(field: FieldPlan, data: dict, semaphore: asyncio.Semaphore):
+        try:
+            value = data if field.kind is DEPENDENT else data[field.lookup]
+            if not field.schema.is_async:
+                return field.schema.check(value)
+            if semaphore is None:
+                return await field.schema.acheck(value)
+            async with semaphore:
+                return await field.schema.acheck(value)
+        except KeyError:
+            return None, field.message
+        except (SchemaError, SchemaErrors) as e:
+            return None, e
+
+    def validate_columns(self, columns: dict) -> (dict, dict):
+        """Validate data given as a dict of field names to columns of values (lists or NumPy arrays).
+
+        Each field validator is applied to its whole column at once. It returns a tuple with the
+        cleaned columns, which only hold the rows without errors, and a dict of the index of each
+        invalid row to its errors dict.
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All the columns must have the same length")
+        length = lengths.pop() if lengths else 0
+
+        errors = {}
+        cleaned = {}
+        invalid = None
+
+        for key, lookup, schema, kind, message in self.plan:
+            if kind is DEPENDENT:
+                if invalid is None:
+                    # the rows with errors in the rest of fields, before the first dependent field
+                    invalid = set(errors)
+                cleaned[key] = self._validate_dependent_column(columns, length, schema, key,
+                                                               message, errors, invalid)
+                continue
+
+            try:
+                column = columns[lookup]
+            except KeyError:
+                if kind is REQUIRED:
+                    for row in range(length):
+                        errors.setdefault(row, {})[key] = message
+                continue
+
+            cleaned[key], column_errors = schema.validate_column(column)
+            for row, error in column_errors.items():
+                errors.setdefault(row, {})[key] = error
+
+        if errors:
+            valid = [row for row in range(length) if row not in errors]
+            cleaned = {key: take(column, valid) for key, column in cleaned.items()}
+
+        return cleaned, errors
+
+    @staticmethod
+    def _validate_dependent_column(columns, length, schema, key, message, errors, invalid):
+        # dependent fields receive the whole row and are only validated in the rows where the rest
+        # of fields are valid
+        cleaned = [None] * length
+        for row in range(length):
+            if row in invalid:
+                continue
+            try:
+                value, error = schema.check({name: column[row] for name, column in columns.items()})
+            except KeyError:
+                value, error = None, message
+            except (SchemaError, SchemaErrors) as e:
+                value, error = None, e
+            if error is None:
+                cleaned[row] = value
+            else:
+                errors.setdefault(row, {})[key] = render_error(error)
+        return cleaned
+
+
+class Tagged(Schema):
+    """Validator for unions of schemas told apart by the value of a tag field.
+
+    The tag is read once from the data and the data is validated only against the schema of
+    that tag, usually a `Map`, which can validate the tag field like any other field. Data
+    without the tag field or with an unknown tag is reported as an error of the tag field.
+    """
+    __slots__ = ("field", "schemas", "messages", "tags_text", "is_async")
+    default_messages = types.MappingProxyType({
+        'required': _("Field `{field}` is required."),
+        'unknown': _("Unknown `{field}` value `{tag}`, expected one of: {tags}"),
+    })
+    accepts_fail_fast = True
+
+    def __init__(self, field: str, schemas: dict, messages=None):
+        self.field = field
+        self.schemas = schemas
+        self.messages = dict(self.default_messages, **messages) if messages else self.default_messages
+        self.tags_text = LazyJoin(schemas)
+        self.is_async = any(schema.is_async for schema in schemas.values())
+
+    def __reduce__(self):
+        messages = None if self.messages is self.default_messages else self.messages
+        return type(self), (self.field, self.schemas, messages)
+
+    def children(self) -> list:
+        return [("[{}]".format(tag), schema) for tag, schema in self.schemas.items()]
+
+    def replace_children(self, children: list) -> "Tagged":
+        return Tagged(self.field, dict(zip(self.schemas, children)), self.messages)
+
+    def _key(self) -> tuple:
+        return self.field, tuple(self.schemas.items()), tuple(sorted(self.messages.items()))
+
+    def select(self, data: dict) -> (Schema, Exception):
+        """Return the schema for the tag of the data, or None and the error of the tag field."""
+        try:
+            tag = data[self.field]
+        except KeyError:
+            message = self.messages['required'].format(field=self.field)
+            return None, SchemaErrors({self.field: message})
+
+        try:
+            return self.schemas[tag], None
+        except (KeyError, TypeError):
+            error = SchemaError(self.messages['unknown'], params={
+                "field": self.field, "tag": tag, "tags": self.tags_text})
+            return None, SchemaErrors({self.field: error})
+
+    def check(self, data: dict, fail_fast: bool=False) -> (object, Exception):
+        schema, error = self.select(data)
+        if error is not None:
+            return None, error
+        if fail_fast and schema.accepts_fail_fast:
+            return schema.check(data, fail_fast=True)
+        return schema.check(data)
+
+    async def acheck(self, data: dict) -> (object, Exception):
+        schema, error = self.select(data)
+        if error is not None:
+            return None, error
+        return await schema.acheck(data)
+
+
+def transform(schema: Schema, function: "callable", path: str="") -> Schema:
+    """Rebuild a schema tree from the leaves up, replacing each validator by the validator
+    returned by `function(validator, path)`.
+
+    The path locates each validator in the tree, like `order.items[1].price`. The validators of
+    the tree are not modified, the ones made of other validators are copied when some of their
+    children are replaced.
+    """
+    children = schema.children()
+    if children:
+        replaced = [
+            transform(child, function, label[1:] if not path and label[0] == "." else path + label)
+            for label, child in children]
+        if any(new is not old for new, (_, old) in zip(replaced, children)):
+            schema = schema.replace_children(replaced)
+    return function(schema, path)
@@ -1,17 +1,115 @@
 from skame.schemas.base import Schema, SchemaError
+from skame.utils import LazyJoin, ResultCache
 from gettext import gettext as _
 
 
 class Choices(Schema):
-    message = _("Value not in the valid choices ({choices})")
+    """Validator for checking if a value is one of the valid choices.
 
-    def __init__(self, choices, message=None):
+    Hashable choices are indexed in a set at construction, so checking a value doesn't depend on the
+    number of choices. `message_limit` sets the maximum number of choices listed in the error
+    message.
+    """
+    __slots__ = ("choices", "message", "index", "unhashable", "choices_text")
+    default_message = _("Value not in the valid choices ({choices})")
+
+    def __init__(self, choices, message=None, message_limit=None):
         self.choices = choices
-        if message:
-            self.message = message
-
-    def validate(self, data: object) -> object:
-        if not data in self.choices:
-            message = self.message.format(choices=", ".join(map(str, self.choices)))
-            raise SchemaError(message)
-        return data
+        self.message = message or self.default_message
+
+        index = set()
+        unhashable = []
+        for choice in choices:
+            try:
+                index.add(choice)
+            except TypeError:
+                unhashable.append(choice)
+
+        self.index = frozenset(index)
+        self.unhashable = tuple(unhashable)
+        self.choices_text = LazyJoin(choices, limit=message_limit)
+
+    def __reduce__(self):
+        # the index is rebuilt from the choices when unpickling
+        return type(self), (self.choices, self.message, self.choices_text.limit)
+
+    def _key(self) -> tuple:
+        # equal choices of other types, like 1 and True, are shown differently in the messages
+        return (type(self.choices), tuple((type(choice), choice) for choice in self.choices),
+                self.message, self.choices_text.limit)
+
+    def _check(self, data):
+        try:
+            if data in self.index:
+                return True
+        except TypeError:
+            # unhashable values are looked up in the original choices
+            return data in self.choices
+        return bool(self.unhashable) and data in self.unhashable
+
+    def get_error(self) -> SchemaError:
+        return SchemaError(self.message, params={"choices": self.choices_text})
+
+    def check(self, data: object) -> (object, Exception):
+        if not self._check(data):
+            return None, self.get_error()
+        return data, None
+
+    def validate_column(self, values: "sequence") -> ("sequence", dict):
+        failed = [index for index, data in enumerate(values) if not self._check(data)]
+        if not failed:
+            return values, {}
+        message = self.get_error().error
+        return values, {index: message for index in failed}
+
+
+class Cached(Schema):
+    """Validator that memoizes the results of another validator.
+
+    The results of the last `maxsize` hashable values are kept, errors included, so repeated
+    values are only validated once. Values of different types are cached apart, and unhashable
+    values are always validated. The cleaned values are shared between calls, so it's meant for
+    validators of immutable values like strings or numbers.
+
+    Asynchronous validators are cached too, and the results of fail-fast validations are cached
+    apart from the complete ones.
+    """
+    __slots__ = ("schema", "cache", "is_async", "accepts_fail_fast")
+
+    def __init__(self, schema: Schema, maxsize: int=1024):
+        self.schema = schema
+        self.cache = ResultCache(maxsize)
+        self.is_async = schema.is_async
+        self.accepts_fail_fast = schema.accepts_fail_fast
+
+    def __reduce__(self):
+        # the cached results are not serialized
+        return type(self), (self.schema, self.cache.maxsize)
+
+    def _accepts_type(self, cls: type) -> bool:
+        return self.schema._accepts_type(cls)
+
+    def children(self) -> list:
+        return [("[0]", self.schema)]
+
+    def replace_children(self, children: list) -> "Cached":
+        return Cached(children[0], self.cache.maxsize)
+
+    def _key(self) -> tuple:
+        return self.schema, self.cache.maxsize
+
+    def check(self, data: object, fail_fast: bool=False) -> (object, Exception):
+        return self.cache.check(self.schema.check, data, fail_fast)
+
+    async def acheck(self, data: object) -> (object, Exception):
+        if not self.is_async:
+            return self.check(data)
+        return await self.cache.acheck(self.schema.acheck, data)
+
+    def cache_info(self) -> "CacheInfo":
+        """Return the hits, misses, maximum size and current size of the cache."""
+        return self.cache.info()
+
+    def cache_clear(self):
+        """Clear the cache and its statistics."""
+        self.cache.clear()
@@ -2,76 +2,106 @@ import re
 
 from gettext import gettext as _
 
+from skame.arrays import as_array, is_array, mask_result, result_errors
 from skame.schemas.base import Schema, Predicate
 from skame.exceptions import SchemaError
 
 
-class IsStrictPositive(Schema):
+class NumericSchema(Schema):
+    """Base class for validators of numbers.
+
+    Subclasses implement `_check` with operators that also work element-wise on NumPy arrays, so
+    they can validate whole arrays at once with `validate_array`.
+    """
+    __slots__ = ("message",)
+
+    def _check(self, data):
+        raise NotImplementedError
+
+    def _key(self) -> tuple:
+        return (self.message,)
+
+    def get_error(self) -> SchemaError:
+        return SchemaError(self.message)
+
+    def check(self, data: object) -> (object, Exception):
+        if not self._check(data):
+            return None, self.get_error()
+        return data, None
+
+    def validate_array(self, array: "numpy.ndarray") -> "ArrayResult":
+        array = as_array(array)
+        return mask_result(self._check(array), self.get_error().error)
+
+    def validate_column(self, values: "sequence") -> ("sequence", dict):
+        if is_array(values):
+            return values, result_errors(self.validate_array(values))
+
+        failed = [index for index, data in enumerate(values) if not self._check(data)]
+        if not failed:
+            return values, {}
+        message = self.get_error().error
+        return values, {index: message for index in failed}
+
+
+class IsStrictPositive(NumericSchema):
     """Validator for checking if a value is greater than zero."""
-    message = _("Value must be a positive number")
+    __slots__ = ()
+    default_message = _("Value must be a positive number")
 
     def __init__(self, message=None):
-        if message:
-            self.message = message
+        self.message = message or self.default_message
 
     def _check(self, data):
         return (data > 0)
 
-    def validate(self, data: object) -> object:
-        if not self._check(data):
-            raise SchemaError(self.message)
-        return data
-
 
-class IsPositiveOrZero(Schema):
+class IsPositiveOrZero(NumericSchema):
     """Validator for checking if a value is greater than or equal zero."""
-    message = _("Value must be a positive number or 0")
+    __slots__ = ()
+    default_message = _("Value must be a positive number or 0")
 
     def __init__(self, message=None):
-        if message:
-            self.message = message
+        self.message = message or self.default_message
 
     def _check(self, data):
         return (data >= 0)
 
-    def validate(self, data: object) -> object:
-        if not self._check(data):
-            raise SchemaError(self.message)
-        return data
-
 
-class MinValue(Schema):
+class MinValue(NumericSchema):
     """Validator for checking if a value is greater or equal than some value."""
-    message = _("Value must be greater or equal than {minValue}")
+    __slots__ = ("minValue",)
+    default_message = _("Value must be greater or equal than {minValue}")
 
     def __init__(self, minValue, message=None):
         self.minValue = minValue
-        if message:
-            self.message = message
+        self.message = message or self.default_message
+
+    def _key(self) -> tuple:
+        # equal values of other types, like 1 and 1.0, are shown differently in the messages
+        return type(self.minValue), self.minValue, self.message
 
     def _check(self, data):
         return (data >= self.minValue)
 
-    def validate(self, data: object) -> object:
-        if not self._check(data):
-            raise SchemaError(self.message.format(minValue = self.minValue))
-        return data
+    def get_error(self) -> SchemaError:
+        return SchemaError(self.message, params={"minValue": self.minValue})
 
 
-class MaxValue(Schema):
+class MaxValue(NumericSchema):
     """Validator for checking if a value is lower or equal than some value."""
-    message = _("Value must be lower or equal than {maxValue}")
+    __slots__ = ("maxValue",)
+    default_message = _("Value must be lower or equal than {maxValue}")
 
     def __init__(self, maxValue, message=None):
         self.maxValue = maxValue
-        if message:
-            self.message = message
+        self.message = message or self.default_message
+
+    def _key(self) -> tuple:
+        return type(self.maxValue), self.maxValue, self.message
 
     def _check(self, data):
         return (data <= self.maxValue)
 
-    def validate(self, data: object) -> object:
-        if not self._check(data):
-            raise SchemaError(self.message.format(maxValue = self.maxValue))
-        return data
-
+    def get_error(self) -> SchemaError:
+        return SchemaError(self.message, params={"maxValue": self.maxValue})
@@ -1,3 +1,4 @@
+import datetime
 import re
 import operator
 
@@ -5,38 +6,56 @@ from gettext import gettext as _
 
 from skame.schemas.base import Schema, Predicate
 from skame.exceptions import SchemaError
+from skame.utils import ResultCache
+
+
+# patterns for the parts of an URL, none of them can backtrack more than a bounded number of steps
+_SCHEME = re.compile(r'[A-Za-z0-9.-]*\Z')
+_DOMAIN_CHARS = re.compile(r'[A-Za-z0-9.-]+\Z')
+_IPV4 = re.compile(r'[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\Z')
+_IPV6 = re.compile(r'\[?[0-9A-Fa-f]*:[0-9A-Fa-f:]+\]?\Z')
+_PORT = re.compile(r'[0-9]+\Z')
+_WHITESPACE = re.compile(r'\s')
+
+# time of the ISO formats: HH:MM[:SS[.fff[fff]]] with an optional UTC offset
+_ISO_TIME = r'[0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{3}(?:[0-9]{3})?)?)?(?:Z|[+-][0-9]{2}:[0-9]{2})?'
 
 
 class NotEmpty(Schema):
     """Validator for checking if a value is not empty (boolean false)."""
-    message = _("Empty value")
+    __slots__ = ("message",)
+    default_message = _("Empty value")
 
     def __init__(self, message=None):
-        if message:
-            self.message = message
+        self.message = message or self.default_message
+
+    def _key(self) -> tuple:
+        return (self.message,)
 
     def _check(self, data):
         return bool(data)
 
-    def validate(self, data: object) -> object:
+    def check(self, data: object) -> (object, Exception):
         if not self._check(data):
-            raise SchemaError(self.message)
-        return data
+            return None, SchemaError(self.message)
+        return data, None
 
 
 class Regex(Schema):
-    regex = ''
-    message = _('Invalid text.')
+    __slots__ = ("regex", "message")
+    default_regex = ''
+    default_message = _('Invalid text.')
 
     def __init__(self, message=None, regex=None):
-        if regex is not None:
-            self.regex = regex
-        if message is not None:
-            self.message = message
+        self.regex = regex if regex is not None else self.default_regex
+        self.message = message if message is not None else self.default_message
 
         if isinstance(self.regex, str):
             self.regex = re.compile(self.regex)
 
+    def _key(self) -> tuple:
+        return self.regex, self.message
+
     def _check(self, data):
         """
         Validates that the input matches the regular expression
@@ -45,50 +64,89 @@ class Regex(Schema):
             return False
         return True
 
-    def validate(self, data: object) -> object:
+    def check(self, data: object) -> (object, Exception):
         if not self._check(data):
-            raise SchemaError(self.message)
-        return data
-
-
-class URL(Regex):
-    regex = re.compile(
-        r'^(?:[a-z0-9\.\-]*)://'  # scheme is validated separately
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}(?<!-)\.?)|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  # ...or ipv4
-        r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  # ...or ipv6
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    message = _('Invalid URL.')
-    schemes = ['http', 'https', 'ftp', 'ftps']
+            return None, SchemaError(self.message)
+        return data, None
+
+
+class URL(Schema):
+    """Validator for checking if a value is an URL.
+
+    The URL is parsed in a single pass over its parts (scheme, host, port and path) instead of
+    matching it against a regular expression, so the time to validate it grows linearly with its
+    length. The host can be a domain name, `localhost` or an IPv4 or IPv6 address.
+    """
+    __slots__ = ("message", "schemes")
+    default_message = _('Invalid URL.')
+    default_schemes = ('http', 'https', 'ftp', 'ftps')
 
     def __init__(self, message=None, schemes=None):
-        super().__init__(message=message)
-        if schemes is not None:
-            self.schemes = schemes
+        self.message = message if message is not None else self.default_message
+        self.schemes = schemes if schemes is not None else self.default_schemes
 
-    def _validate_scheme(self, data):
-        scheme = data.split('://')[0].lower()
+    def _key(self) -> tuple:
+        return self.message, tuple(self.schemes)
 
-        if scheme in self.schemes:
+    def _validate_scheme(self, scheme):
+        return scheme.lower() in self.schemes and _SCHEME.match(scheme) is not None
+
+    def _validate_domain(self, host):
+        if host.endswith('.'):
+            host = host[:-1]
+        dot = host.rfind('.')
+        tld = host[dot + 1:]
+
+        # labels of 1 to 63 letters, digits or hyphens, not starting nor ending with a hyphen,
+        # followed by a top level domain of at least 2 of them, not ending with a hyphen
+        if (dot < 1 or len(tld) < 2 or tld[-1] == '-' or host[0] in '-.' or '..' in host or
+                '-.' in host or host.find('.-', 0, dot) != -1 or _DOMAIN_CHARS.match(host) is None):
+            return False
+        return dot < 64 or max(map(len, host[:dot].split('.'))) < 64
+
+    def _validate_host(self, host):
+        return (self._validate_domain(host) or host.lower() == 'localhost' or
+                _IPV4.match(host) is not None or _IPV6.match(host) is not None)
+
+    def _validate_authority(self, authority):
+        if self._validate_host(authority):
             return True
+        host, separator, port = authority.rpartition(':')
+        return _PORT.match(port) is not None and self._validate_host(host)
 
-        return False
+    def _validate_path(self, path):
+        # the path (or query) can't contain whitespace
+        return not path or path == '/' or (len(path) > 1 and _WHITESPACE.search(path, 1) is None)
 
     def _check(self, data):
-        if not self._validate_scheme(data):
+        if not isinstance(data, str):
             return False
 
-        if not super()._check(data):
+        scheme, separator, rest = data.partition('://')
+        if not separator or not self._validate_scheme(scheme):
             return False
 
-        return True
+        if rest.endswith('\n'):
+            # a single trailing newline is allowed, like `$` does in regular expressions
+            rest = rest[:-1]
+        end = len(rest)
+        for separator in '/?':
+            position = rest.find(separator, 0, end)
+            if position != -1:
+                end = position
+
+        return self._validate_authority(rest[:end]) and self._validate_path(rest[end:])
+
+    def check(self, data: object) -> (object, Exception):
+        if not self._check(data):
+            return None, SchemaError(self.message)
+        return data, None
 
 
 class Email(Schema):
     """Validator for checking if a value is an email."""
-    message = _("Invalid email format")
+    __slots__ = ("message", "domain_whitelist")
+    default_message = _("Invalid email format")
     user_regex = re.compile(
         r"(^[-!#$%&'*+/=?^_`{}|~0-9A-Z]+(\.[-!#$%&'*+/=?^_`{}|~0-9A-Z]+)*$"  # dot-atom
         r'|^"([\001-\010\013\014\016-\037!#-\[\]-\177]|\\[\001-\011\013\014\016-\177])*"$)',  # quoted-string
@@ -96,14 +154,14 @@ class Email(Schema):
     domain_regex = re.compile(
         r'(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}|[A-Z0-9-]{2,}(?<!-))$',
         re.IGNORECASE)
-    domain_whitelist = []
+    default_domain_whitelist = ()
 
     def __init__(self, message=None, domain_whitelist=None):
-        if message:
-            self.message = message
+        self.message = message or self.default_message
+        self.domain_whitelist = domain_whitelist or self.default_domain_whitelist
 
-        if domain_whitelist:
-            self.domain_whitelist = domain_whitelist
+    def _key(self) -> tuple:
+        return self.message, tuple(self.domain_whitelist)
 
     def _validate_user_part(self, username):
         return self.user_regex.match(username) is not None
@@ -131,45 +189,124 @@ class Email(Schema):
 
         return True
 
-    def validate(self, data: object) -> object:
+    def check(self, data: object) -> (object, Exception):
         if not self._check(data):
-            raise SchemaError(self.message)
-        return data
+            return None, SchemaError(self.message)
+        return data, None
 
 
-class ISODate(Schema):
-    """Validator for checking if a value a date in ISO format (YYYY-MM-DD)."""
-    message = _("Invalid ISO date")
+class ISOFormat(Schema):
+    """Base class for validators of dates and times in ISO format.
 
-    def __init__(self, message=None):
-        if message:
-            self.message = message
+    Subclasses implement `_parse` to convert a text into its value or raise `ValueError`. When
+    `cache_size` is given the results of that number of recent texts are kept, errors included,
+    as the same dates tend to repeat a lot in the data.
+    """
+    __slots__ = ("message", "cache")
+
+    def __init__(self, message=None, cache_size=None):
+        self.message = message or self.default_message
+        self.cache = ResultCache(cache_size) if cache_size else None
+
+    def __reduce__(self):
+        # the cached results are not serialized
+        return type(self), (self.message, self.cache.maxsize if self.cache is not None else None)
+
+    def _key(self) -> tuple:
+        return self.message, self.cache.maxsize if self.cache is not None else None
 
-    def validate(self, data: object) -> object:
-        from datetime import datetime
+    def _parse(self, data):
+        raise NotImplementedError
+
+    def _check(self, data: object) -> (object, Exception):
         try:
-            cleaned_data = datetime.strptime(data, '%Y-%m-%d').date()
-            return cleaned_data
+            return self._parse(data), None
         except (ValueError, TypeError):
-            raise SchemaError(self.message)
+            return None, SchemaError(self.message)
+
+    def check(self, data: object) -> (object, Exception):
+        if self.cache is None or type(data) is not str:
+            return self._check(data)
+        return self.cache.check(self._check, data)
+
+
+class ISODate(ISOFormat):
+    """Validator for checking if a value a date in ISO format (YYYY-MM-DD)."""
+    __slots__ = ()
+    default_message = _("Invalid ISO date")
+    regex = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')
+    # `strptime` also accepts months and days without padding, or padded with a space
+    loose_regex = re.compile(r'\d{4}-\d{1,2}-[ \d]?\d\Z')
+
+    def _parse(self, data):
+        if self.regex.match(data) is not None:
+            return datetime.date.fromisoformat(data)
+        if self.loose_regex.match(data) is not None:
+            return datetime.datetime.strptime(data, '%Y-%m-%d').date()
+        raise ValueError(data)
+
+
+class ISODateTime(ISOFormat):
+    """Validator for checking if a value a date and time in ISO format
+    (YYYY-MM-DDTHH:MM[:SS[.ffffff]][+HH:MM]).
+
+    The separator can also be a space and the UTC offset `Z`, aware datetimes are returned for
+    values with an UTC offset.
+    """
+    __slots__ = ()
+    default_message = _("Invalid ISO datetime")
+    regex = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}[T ]' + _ISO_TIME + r'\Z')
+
+    def _parse(self, data):
+        if self.regex.match(data) is None:
+            raise ValueError(data)
+        if data.endswith('Z'):
+            data = data[:-1] + '+00:00'
+        return datetime.datetime.fromisoformat(data)
+
+
+class ISOTime(ISOFormat):
+    """Validator for checking if a value a time in ISO format (HH:MM[:SS[.ffffff]][+HH:MM]).
+
+    The UTC offset can also be `Z`, aware times are returned for values with an UTC offset.
+    """
+    __slots__ = ()
+    default_message = _("Invalid ISO time")
+    regex = re.compile(_ISO_TIME + r'\Z')
+
+    def _parse(self, data):
+        if self.regex.match(data) is None:
+            raise ValueError(data)
+        if data.endswith('Z'):
+            data = data[:-1] + '+00:00'
+        return datetime.time.fromisoformat(data)
 
 
 class Length(Predicate):
-    message = _('Wrong length. Must be {length}.')
+    __slots__ = ("length",)
+    default_message = _('Wrong length. Must be {length}.')
     op = operator.eq
 
     def __init__(self, length, message=None):
-        super().__init__(lambda data: self.op(len(data), length), message)
         self.length = length
+        self.message = message or self.default_message
+
+    def _key(self) -> tuple:
+        return type(self.length), self.length, self.message
+
+    def predicate(self, data):
+        return self.op(len(data), self.length)
 
-    def get_message(self, data):
-        return self.message.format(length=self.length)
+    def get_params(self, data):
+        return {"length": self.length}
 
 class MaxLength(Length):
-    message = _('Too long string. Max {length}.')
+    __slots__ = ()
+    default_message = _('Too long string. Max {length}.')
     op = operator.lt
 
 
 class MinLength(Length):
-    message = _('Too short string. Min {length}.')
+    __slots__ = ()
+    default_message = _('Too short string. Min {length}.')
     op = operator.gt
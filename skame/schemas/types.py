@@ -3,50 +3,70 @@ from skame.schemas.base import Type, StrictType, Is
 import datetime
 
 class Int(StrictType):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(int, message)
 
 
 class Float(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(float, message)
 
 
 class Complex(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(complex, message)
 
 
 class String(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(str, message)
 
 
 class List(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(list, message)
 
 
 class Dict(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(dict, message)
 
 
 class Bool(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(bool, message)
 
 
 class Date(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(datetime.date, message)
 
 
 class DateTime(Type):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(datetime.datetime, message)
 
 
 class IsNone(Is):
+    __slots__ = ()
+
     def __init__(self, message=None):
         super().__init__(None, message)
@@ -0,0 +1,17 @@
+import pickle
+import pickletools
+
+
+def dumps(schema: "Schema") -> bytes:
+    """Serialize a schema into a compact bytes representation.
+
+    Built-in schemas only serialize their parameters, derived state such as the field plan of a
+    `Map` or the index of `Choices` is rebuilt by `loads`. Schemas holding lambdas or other
+    callables that can't be pickled can't be serialized.
+    """
+    return pickletools.optimize(pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def loads(data: bytes) -> "Schema":
+    """Rebuild a schema serialized with `dumps`."""
+    return pickle.loads(data)
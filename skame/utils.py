@@ -1,9 +1,169 @@
+import collections
+import importlib
+import itertools
+
+from skame.exceptions import SchemaError, SchemaErrors
+
+
 def compose(f, g, *rest):
     """Compose the given functions into one function.
 
+    The functions are applied from right to left in a loop, so the length of the composition does
+    not affect the depth of the stack.
+
     :returns: A function that is the composition of the given functions.
     :rtype: function
     """
-    if not rest:
-        return lambda *args, **kwargs: f(g(*args, **kwargs))
-    return compose(f, compose(g, *rest))
+    functions = (f, g) + rest
+    first = functions[-1]
+    others = functions[-2::-1]
+
+    def composition(*args, **kwargs):
+        result = first(*args, **kwargs)
+        for function in others:
+            result = function(result)
+        return result
+
+    return composition
+
+
+def import_object(path: str) -> object:
+    """Import an object given its path in the form `module:attribute`.
+
+    The attribute can be a dotted path to an object nested in the module.
+    """
+    module_name, separator, attribute = path.partition(":")
+    if not separator or not module_name or not attribute:
+        raise ValueError("`{}` is not in the form `module:attribute`".format(path))
+
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class LazyJoin:
+    """Text made of items joined by a separator that is only built the first time it's formatted.
+
+    When `limit` is given only that number of items are included followed by a count of the
+    omitted ones.
+    """
+    __slots__ = ("items", "key", "separator", "limit", "_text")
+
+    def __init__(self, items: "iterable", key: "callable"=str, separator: str=", ", limit: int=None):
+        self.items = items
+        self.key = key
+        self.separator = separator
+        self.limit = limit
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            if self.limit is None or len(self.items) <= self.limit:
+                self._text = self.separator.join(map(self.key, self.items))
+            else:
+                items = itertools.islice(self.items, self.limit)
+                self._text = "{}{}... ({} more)".format(
+                    self.separator.join(map(self.key, items)), self.separator,
+                    len(self.items) - self.limit)
+        return self._text
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+
+CacheInfo = collections.namedtuple("CacheInfo", ("hits", "misses", "maxsize", "currsize"))
+
+
+class LRUCache:
+    """Mapping of a bounded size that evicts its least recently used entries.
+
+    It counts the hits and misses of `get`, which are reported with `info` like the caches of
+    `functools.lru_cache`. Looking up unhashable keys raises `TypeError`.
+    """
+    __slots__ = ("maxsize", "hits", "misses", "_data")
+
+    def __init__(self, maxsize: int=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+
+    def get(self, key: "hashable", default: object=None) -> object:
+        data = self._data
+        try:
+            value = data[key]
+            data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: "hashable", value: object):
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class ResultCache(LRUCache):
+    """`LRUCache` of validation results, the `(cleaned, error)` tuples of `check`.
+
+    The results are keyed by the validated values and their types, so equal values of different
+    types are cached apart, and unhashable values are always validated. The same error is returned
+    on every hit, without the traceback of the last time it was raised.
+    """
+    __slots__ = ()
+
+    def _lookup(self, key: tuple) -> tuple:
+        result = self.get(key, _MISSING)
+        if result is not _MISSING and result[1] is not None:
+            result[1].with_traceback(None)
+        return result
+
+    def check(self, check: "callable", data: object, fail_fast: bool=False) -> (object, Exception):
+        """Return the result of `check(data)`, checking the data only when it's not cached."""
+        try:
+            key = (type(data), data, fail_fast)
+            result = self._lookup(key)
+        except TypeError:
+            return check(data, fail_fast=True) if fail_fast else check(data)
+
+        if result is _MISSING:
+            try:
+                result = check(data, fail_fast=True) if fail_fast else check(data)
+            except (SchemaError, SchemaErrors) as e:
+                result = None, e
+            self.set(key, result)
+        return result
+
+    async def acheck(self, acheck: "callable", data: object) -> (object, Exception):
+        """Asynchronous version of `check`."""
+        try:
+            key = (type(data), data, False)
+            result = self._lookup(key)
+        except TypeError:
+            return await acheck(data)
+
+        if result is _MISSING:
+            try:
+                result = await acheck(data)
+            except (SchemaError, SchemaErrors) as e:
+                result = None, e
+            self.set(key, result)
+        return result
@@ -1,4 +1,5 @@
 from .exceptions import SchemaErrors
+from .hooks import global_hooks, Traced
 
 
 def clean_data_or_raise(schema: "Schema", data: dict, exc_type: "Exception"=SchemaErrors) -> dict:
@@ -7,23 +8,80 @@ def clean_data_or_raise(schema: "Schema", data: dict, exc_type: "Exception"=Sche
     If the data is not valid, an exception of type `exc_type` is raised with the form errors dict
     as its message.
     """
+    if global_hooks.enabled:
+        schema = Traced(schema, "", global_hooks)
     try:
         return schema.validate(data)
     except SchemaErrors as e:
         raise exc_type(e.errors)
 
 
-def validate(schema: "Schema", data: dict) -> (dict, dict):
+def validate(schema: "Schema", data: dict, fail_fast: bool=False) -> (dict, dict):
     """Helper method for validate an schema.
 
     It returns a tuple with first argument with cleaned data and second
     argument errors.
 
-    The second argument can be None if no errors found.
+    The second argument can be None if no errors found. With `fail_fast`
+    the validation stops at the first error.
     """
+    if global_hooks.enabled:
+        schema = Traced(schema, "", global_hooks)
 
     try:
-        cleaned_data = schema.validate(data)
+        if fail_fast and schema.accepts_fail_fast:
+            cleaned_data, error = schema.check(data, fail_fast=True)
+        else:
+            cleaned_data, error = schema.check(data)
+    except SchemaErrors as e:
+        return None, e.errors
+
+    if error is None:
         return cleaned_data, None
+    if isinstance(error, SchemaErrors):
+        return None, error.errors
+    raise error
+
+
+async def avalidate(schema: "Schema", data: dict) -> (dict, dict):
+    """Asynchronous version of `validate`, for schemas with asynchronous validators."""
+    if global_hooks.enabled:
+        schema = Traced(schema, "", global_hooks)
+    try:
+        cleaned_data, error = await schema.acheck(data)
     except SchemaErrors as e:
         return None, e.errors
+
+    if error is None:
+        return cleaned_data, None
+    if isinstance(error, SchemaErrors):
+        return None, error.errors
+    raise error
+
+
+def validate_batch(schema: "Schema", iterable: "iterable", fail_fast: bool=False) -> "generator":
+    """Helper method for validate many items against an schema.
+
+    It yields a tuple for each item with its index, cleaned data and errors, the errors are None
+    if the item is valid and the cleaned data is None otherwise. With `fail_fast` only the first
+    error of each item is reported.
+    """
+    if global_hooks.enabled:
+        schema = Traced(schema, "", global_hooks)
+    return schema.validate_many(iterable, fail_fast=fail_fast)
+
+
+def clean_many_or_raise(schema: "Schema", iterable: "iterable",
+                        exc_type: "Exception"=SchemaErrors, fail_fast: bool=False) -> "generator":
+    """Clean each item of an iterable by passing it through a specified schema definition.
+
+    It yields the cleaned items. When an item is not valid an exception of type `exc_type` is
+    raised with a dict of the item index to its errors as its message, only its first error
+    with `fail_fast`.
+    """
+    if global_hooks.enabled:
+        schema = Traced(schema, "", global_hooks)
+    for index, cleaned, errors in schema.validate_many(iterable, fail_fast=fail_fast):
+        if errors is not None:
+            raise exc_type({index: errors})
+        yield cleaned
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from skame.schemas import base as b
+from skame.schemas.common import Cached
+from skame.schemas.strings import NotEmpty
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.validator import avalidate
+
+
+class FakeService:
+    """Service answering after some latency, keeping track of the concurrent requests."""
+
+    def __init__(self, taken=("admin",)):
+        self.taken = set(taken)
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def is_available(self, username):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return username not in self.taken
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_async_predicate():
+    service = FakeService()
+    schema = b.AsyncPredicate(service.is_available, "Username is taken")
+
+    assert schema.is_async
+    assert run(schema.avalidate("bob")) == "bob"
+    with pytest.raises(SchemaError) as excinfo:
+        run(schema.avalidate("admin"))
+    assert excinfo.value.error == "Username is taken"
+
+
+def test_async_predicate_requires_avalidate():
+    schema = b.AsyncPredicate(FakeService().is_available)
+
+    with pytest.raises(TypeError):
+        schema.validate("bob")
+
+
+def test_sync_schema_avalidate():
+    schema = b.And(b.Type(str), NotEmpty())
+
+    assert not schema.is_async
+    assert run(schema.avalidate("bob")) == "bob"
+    with pytest.raises(SchemaError):
+        run(schema.avalidate(""))
+
+
+def test_async_logic_and_or():
+    service = FakeService()
+    username = b.And(b.Type(str), b.AsyncPredicate(service.is_available, "Username is taken"))
+    schema = b.Or(b.Is(None), username)
+
+    assert username.is_async and schema.is_async
+    assert run(username.avalidate("bob")) == "bob"
+    assert run(schema.avalidate(None)) is None
+    with pytest.raises(SchemaError) as excinfo:
+        run(username.avalidate(123))
+    assert excinfo.value.error == "Not of type `<class 'str'>`"
+    assert service.calls == 1
+    with pytest.raises(SchemaError):
+        run(schema.avalidate("admin"))
+
+
+def test_async_map():
+    service = FakeService()
+    schema = b.Map({
+        "username": b.AsyncPredicate(service.is_available, "Username is taken"),
+        "alias": b.AsyncPredicate(service.is_available, "Alias is taken"),
+        b.Optional("name"): NotEmpty(),
+        b.Dependent("display"): b.Pipe(lambda d: "{username} ({alias})".format(**d)),
+    })
+
+    assert schema.is_async
+    assert run(schema.avalidate({"username": "bob", "alias": "b"})) == {
+        "username": "bob", "alias": "b", "display": "bob (b)"}
+    assert service.max_running == 2
+
+    with pytest.raises(SchemaErrors) as excinfo:
+        run(schema.avalidate({"username": "admin", "name": ""}))
+    assert excinfo.value.errors == {"username": "Username is taken",
+                                    "alias": "Field `alias` is required.",
+                                    "name": "Empty value"}
+
+
+def test_async_map_concurrency():
+    service = FakeService()
+    schema = b.Map({"field{}".format(n): b.AsyncPredicate(service.is_available)
+                    for n in range(10)}, concurrency=3)
+    data = {"field{}".format(n): n for n in range(10)}
+
+    assert run(schema.avalidate(data)) == data
+    assert service.max_running == 3
+
+
+def test_async_nested_map():
+    service = FakeService()
+    schema = b.Map({
+        "user": b.Map({"username": b.AsyncPredicate(service.is_available, "Username is taken")}),
+    })
+
+    cleaned, errors = run(avalidate(schema, {"user": {"username": "bob"}}))
+    assert cleaned == {"user": {"username": "bob"}} and errors is None
+    cleaned, errors = run(avalidate(schema, {"user": {"username": "admin"}}))
+    assert cleaned is None
+    assert errors == {"user": {"username": "Username is taken"}}
+
+
+def test_async_cached():
+    service = FakeService()
+    schema = b.Map({"username": Cached(b.AsyncPredicate(service.is_available, "Taken"))})
+
+    assert schema.is_async
+    assert run(schema.avalidate({"username": "bob"})) == {"username": "bob"}
+    assert run(schema.avalidate({"username": "bob"})) == {"username": "bob"}
+    with pytest.raises(SchemaErrors):
+        run(schema.avalidate({"username": "admin"}))
+    assert service.calls == 2
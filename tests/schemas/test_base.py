@@ -1,8 +1,10 @@
 import pytest
 
-from skame.schemas import base as b
-from skame.exceptions import SchemaError, SchemaErrors
-from skame.validator import clean_data_or_raise, validate
+from skame.schemas import base as b, types as t
+from skame.schemas.strings import NotEmpty
+from skame.exceptions import SchemaError, SchemaErrors, render_error
+from skame.validator import (clean_data_or_raise, validate, validate_batch,
+                             clean_many_or_raise)
 
 
 def test_schema_as_predicate():
@@ -40,6 +42,25 @@ def test_schema_as_pipe():
         b.Pipe(int).validate(None)
 
 
+def test_schema_as_pipe_watching_for_exceptions():
+    import json
+
+    with pytest.raises(SchemaError):
+        b.Pipe(json.loads).validate("{", (ValueError,))
+    with pytest.raises(SchemaError):
+        b.Pipe(json.loads).validate("{", watch_for_exceptions=ValueError)
+    with pytest.raises(TypeError):
+        b.Pipe(int).validate(None, (ValueError,))
+
+    schema = b.Pipe(json.loads, watch_for_exceptions=(ValueError,))
+    assert schema.validate("[1]") == [1]
+    assert schema.check("{")[1] is not None
+    with pytest.raises(TypeError):
+        schema.check(None)
+    with pytest.raises(TypeError):
+        b.Map({"a": schema}).validate({"a": None})
+
+
 def test_schema_logic_and():
     assert b.And(b.Pipe(int), b.Predicate(lambda n: n == 42)).validate("42") == 42
     with pytest.raises(SchemaError):
@@ -89,6 +110,79 @@ def test_schema_as_map_optional_fields():
         validator.validate({"name": "John", "age": 1.2})
 
 
+def test_schema_check():
+    assert b.Type(int).check(1) == (1, None)
+
+    cleaned, error = b.Type(int).check("1")
+    assert cleaned is None
+    assert isinstance(error, SchemaError)
+    assert error.error == "Not of type `<class 'int'>`"
+
+    cleaned, error = b.Map({"name": b.Type(str)}).check({})
+    assert cleaned is None
+    assert isinstance(error, SchemaErrors)
+    assert error.errors == {"name": "Field `name` is required."}
+
+
+def test_schema_check_on_validate_subclasses():
+    class Even(b.Schema):
+        def validate(self, data):
+            if data % 2:
+                raise SchemaError("Odd")
+            return data
+
+    assert Even().check(2) == (2, None)
+    assert Even().check(1)[1].error == "Odd"
+    assert b.Or(Even(), b.Is(1)).validate(1) == 1
+    assert b.Map({"n": b.And(b.Pipe(int), Even())}).validate({"n": "4"}) == {"n": 4}
+
+    with pytest.raises(TypeError):
+        b.Schema()
+
+    class Abstract(b.Schema):
+        pass
+
+    with pytest.raises(TypeError):
+        Abstract()
+
+
+def test_schema_check_on_validate_subclasses_of_validators():
+    class Upper(NotEmpty):
+        def validate(self, data, fail_fast=False):
+            return super().validate(data).upper()
+
+    assert Upper().validate("x") == "X"
+    assert Upper().check("x") == ("X", None)
+    assert b.Map({"a": Upper()}).validate({"a": "x"}) == {"a": "X"}
+    assert b.And(Upper(), b.Predicate(lambda s: s == "X")).validate("x") == "X"
+    assert b.Or(b.Is(1), Upper()).validate("x") == "X"
+    assert validate(b.Map({"a": Upper()}), {"a": "x"}) == ({"a": "X"}, None)
+    assert b.Map({"a": Upper()}).validate_columns({"a": ["x", "y"]}) == ({"a": ["X", "Y"]}, {})
+
+    with pytest.raises(SchemaErrors):
+        b.Map({"a": Upper()}).validate({"a": ""})
+
+    class Even(t.Int):
+        def validate(self, data):
+            data = super().validate(data)
+            if data % 2:
+                raise SchemaError("Odd")
+            return data
+
+    # the type of the value doesn't tell if the subclass accepts it
+    assert b.Or(Even(), b.Is(1)).validate(1) == 1
+    assert b.Or(Even(), b.Pipe(str)).validate(3) == "3"
+
+
+def test_schema_check_catches_raised_errors():
+    def raising(data):
+        raise SchemaError("Not valid")
+
+    schema = b.Map({"name": b.Pipe(raising)})
+    assert schema.check({"name": "x"})[1].errors == {"name": "Not valid"}
+    assert b.Or(b.Is(1), b.Pipe(raising)).validate(1) == 1
+
+
 def test_schema_singledispatch():
     import os
 
@@ -150,6 +244,42 @@ class TestValidate:
         assert validate(self.schema, data) == (None, {"age": "User age must be an integer"})
 
 
+class TestValidateBatch:
+    schema = b.schema({
+        "name": b.Predicate(lambda name: len(name) > 0),
+        "age": b.Pipe(int, message="User age must be an integer"),
+    })
+    records = [
+        {"name": "skame", "age": "28"},
+        {"name": "skame", "age": "skame"},
+        {"age": 1},
+    ]
+
+    def test_validate_many(self):
+        assert list(b.Pipe(int).validate_many(["1", "one"])) == [
+            (0, 1, None),
+            (1, None, "invalid literal for int() with base 10: 'one'"),
+        ]
+
+    def test_validate_batch(self):
+        assert list(validate_batch(self.schema, self.records)) == [
+            (0, {"name": "skame", "age": 28}, None),
+            (1, None, {"age": "User age must be an integer"}),
+            (2, None, {"name": "Field `name` is required."}),
+        ]
+
+    def test_validate_batch_is_lazy(self):
+        results = validate_batch(self.schema, iter(self.records))
+        assert next(results) == (0, {"name": "skame", "age": 28}, None)
+
+    def test_clean_many_or_raise(self):
+        assert list(clean_many_or_raise(self.schema, self.records[:1])) == [{"name": "skame", "age": 28}]
+
+        with pytest.raises(SchemaErrors) as exc:
+            list(clean_many_or_raise(self.schema, self.records))
+        assert exc.value.errors == {1: {"age": "User age must be an integer"}}
+
+
 def test_nested_map_errors():
     data = {
         "name": 1000,
@@ -178,3 +308,508 @@ def test_nested_map_errors():
         }
     }
     assert expected == exc.value.errors
+
+
+def test_schema_map_plan():
+    schema = b.Map({
+        b.Dependent("total"): b.Pipe(lambda data: data["price"] * data["qty"]),
+        "price": b.Type(int),
+        b.Optional("qty"): b.Type(int),
+    })
+    assert [(f.key, f.kind) for f in schema.plan] == [
+        ("price", b.REQUIRED), ("qty", b.OPTIONAL), ("total", b.DEPENDENT)]
+    assert schema.plan[1].lookup == "qty"
+    assert schema.plan[0].message == "Field `price` is required."
+
+
+def test_schema_map_dependent_fields():
+    schema = b.Map({
+        "price": b.Type(int),
+        b.Optional("qty"): b.Type(int),
+        b.Dependent("total"): b.Pipe(lambda data: data["price"] * data["qty"]),
+    })
+    assert schema.validate({"price": 2, "qty": 3}) == {"price": 2, "qty": 3, "total": 6}
+
+    with pytest.raises(SchemaErrors) as exc:
+        schema.validate({"price": 2})
+    assert exc.value.errors == {"total": "Field `total` is required."}
+
+    with pytest.raises(SchemaErrors) as exc:
+        schema.validate({"price": "2", "qty": 3})
+    assert exc.value.errors == {"price": "Not of type `<class 'int'>`"}
+
+
+def test_schema_map_failing_dependent_fields():
+    schema = b.Map({
+        "price": b.Type(int),
+        b.Dependent("total"): b.Pipe(lambda data: data["price"] * data["qty"]),
+        b.Dependent("label"): b.Pipe(lambda data: data["name"]),
+    })
+
+    with pytest.raises(SchemaErrors) as exc:
+        schema.validate({"price": 2})
+    assert exc.value.errors == {"total": "Field `total` is required.",
+                                "label": "Field `label` is required."}
+
+    with pytest.raises(SchemaErrors) as exc:
+        schema.validate({"price": 2}, fail_fast=True)
+    assert exc.value.errors == {"total": "Field `total` is required."}
+
+
+def test_schema_logic_and_flattening():
+    first, second, third = b.Pipe(int), b.Pipe(str), b.Pipe(len)
+    schema = b.And(b.And(first, second), third)
+    assert schema.conditions == [first, second, third]
+    assert schema.validate(12.5) == 2
+
+
+def test_schema_logic_and_long_chain():
+    schema = b.Pipe(lambda n: n + 1)
+    for _ in range(5000):
+        schema = b.And(schema, b.Pipe(lambda n: n + 1))
+    assert schema.validate(0) == 5001
+
+
+def test_schema_logic_or_flattening():
+    first, second, third = b.Is(1), b.Is(2), b.Is(3)
+    schema = b.Or(b.Or(first, second), third)
+    assert schema.conditions == [third, second, first]
+    assert schema.validate(1) == 1
+    with pytest.raises(SchemaError) as exc:
+        schema.validate(4)
+    assert exc.value.error == "All conditions failed: Is not `3`, Is not `2`, Is not `1`"
+
+    inner = b.Or(first, second, message="Not one or two")
+    assert b.Or(inner, third).conditions == [third, inner]
+
+
+class TestValidateColumns:
+    from skame.schemas.common import Choices
+    from skame.schemas.numeric import IsStrictPositive
+
+    schema = b.Map({
+        "name": b.Type(str),
+        "price": b.And(b.Pipe(float), IsStrictPositive()),
+        "currency": Choices(["EUR", "USD"]),
+        b.Optional("qty"): b.Type(int),
+        b.Dependent("total"): b.Pipe(lambda row: float(row["price"]) * row.get("qty", 1)),
+    })
+
+    def test_valid_columns(self):
+        columns = {"name": ["a", "b"], "price": ["1.5", 2], "currency": ["EUR", "USD"], "qty": [2, 1]}
+        assert self.schema.validate_columns(columns) == ({
+            "name": ["a", "b"],
+            "price": [1.5, 2.0],
+            "currency": ["EUR", "USD"],
+            "qty": [2, 1],
+            "total": [3.0, 2.0],
+        }, {})
+
+    def test_invalid_columns(self):
+        columns = {"name": ["a", 2, "c", "d"], "price": ["1", "-1", "x", "4"],
+                   "currency": ["EUR", "EUR", "GBP", "USD"]}
+        cleaned, errors = self.schema.validate_columns(columns)
+        assert cleaned == {"name": ["a", "d"], "price": [1.0, 4.0], "currency": ["EUR", "USD"],
+                           "total": [1.0, 4.0]}
+        assert errors == {
+            1: {"name": "Not of type `<class 'str'>`", "price": "Value must be a positive number"},
+            2: {"price": "could not convert string to float: 'x'",
+                "currency": "Value not in the valid choices (EUR, USD)"},
+        }
+
+    def test_missing_columns(self):
+        cleaned, errors = self.schema.validate_columns({"name": ["a"], "price": [1]})
+        assert cleaned == {"name": [], "price": [], "total": []}
+        assert errors == {0: {"currency": "Field `currency` is required."}}
+
+    def test_failing_dependent_columns(self):
+        schema = b.Map({
+            "price": b.Type(int),
+            b.Dependent("total"): b.Pipe(lambda row: row["price"] * row["qty"]),
+            b.Dependent("label"): b.Pipe(lambda row: row["name"] + "!"),
+        })
+        cleaned, errors = schema.validate_columns({"price": [1, "2"], "name": [None, "b"]})
+        assert cleaned == {"price": [], "total": [], "label": []}
+        assert errors == {
+            0: {"total": "Field `total` is required.",
+                "label": "unsupported operand type(s) for +: 'NoneType' and 'str'"},
+            1: {"price": "Not of type `<class 'int'>`"},
+        }
+
+    def test_columns_of_different_length(self):
+        with pytest.raises(ValueError):
+            self.schema.validate_columns({"name": ["a"], "price": [1, 2], "currency": ["EUR"]})
+
+    def test_numpy_columns(self):
+        numpy = pytest.importorskip("numpy")
+        from skame.schemas.numeric import MaxValue
+
+        schema = b.Map({"price": b.And(self.IsStrictPositive(), MaxValue(10))})
+        cleaned, errors = schema.validate_columns({"price": numpy.array([1.0, -2.0, 20.0, 3.0])})
+        assert cleaned["price"].tolist() == [1.0, 3.0]
+        assert errors == {1: {"price": "Value must be a positive number"},
+                          2: {"price": "Value must be lower or equal than 10"}}
+
+
+class TestFailFast:
+    schema = b.Map({
+        "name": b.Type(str),
+        "age": b.Type(int),
+        "address": b.And(b.Type(dict), b.Map({"street": b.Type(str), "city": b.Type(str)})),
+    })
+
+    def test_valid(self):
+        data = {"name": "Bob", "age": 30, "address": {"street": "Main", "city": "Here"}}
+        assert self.schema.validate(data, fail_fast=True) == data
+
+    def test_stops_at_first_error(self):
+        with pytest.raises(SchemaErrors) as excinfo:
+            self.schema.validate({"name": 1, "age": "30"}, fail_fast=True)
+        assert excinfo.value.errors == {"name": "Not of type `<class 'str'>`"}
+
+        with pytest.raises(SchemaErrors) as excinfo:
+            self.schema.validate({"name": 1, "age": "30"})
+        assert len(excinfo.value.errors) == 3
+
+    def test_nested(self):
+        data = {"name": "Bob", "age": 30, "address": {}}
+        assert validate(self.schema, data, fail_fast=True) == (
+            None, {"address": {"street": "Field `street` is required."}})
+        assert validate(self.schema, data)[1] == {"address": {
+            "street": "Field `street` is required.", "city": "Field `city` is required."}}
+
+    def test_skips_remaining_fields(self):
+        calls = []
+        schema = b.Map({"a": b.Is(1), "b": b.Predicate(calls.append)})
+
+        assert validate(schema, {"a": 2, "b": 2}, fail_fast=True)[1] == {"a": "Is not `1`"}
+        assert calls == []
+
+    def test_batch(self):
+        items = [{"name": "Bob", "age": 30, "address": {"street": "Main", "city": "Here"}}, {}]
+
+        results = list(validate_batch(self.schema, items, fail_fast=True))
+        assert results[1] == (1, None, {"name": "Field `name` is required."})
+
+        with pytest.raises(SchemaErrors) as excinfo:
+            list(clean_many_or_raise(self.schema, items, fail_fast=True))
+        assert excinfo.value.errors == {1: {"name": "Field `name` is required."}}
+
+    def test_leaf_schemas(self):
+        assert b.Type(int).validate(1, fail_fast=True) == 1
+        with pytest.raises(SchemaError):
+            b.Type(int).validate("1", fail_fast=True)
+
+
+class TestOrDispatch:
+    def test_dispatch_table(self):
+        schema = b.Or(t.Int(), t.String(), t.IsNone(), b.And(t.Float(), b.Pipe(int)))
+
+        assert schema.validate(1) == 1
+        assert schema.validate("1") == "1"
+        assert schema.validate(None) is None
+        assert schema.validate(1.5) == 1
+        assert schema.dispatch[int] == (schema.conditions[3],)
+        assert schema.dispatch[type(None)] == (schema.conditions[1],)
+        assert schema.dispatch[float] == (schema.conditions[0],)
+
+    def test_unknown_conditions_are_tried(self):
+        calls = []
+        schema = b.Or(b.Predicate(lambda n: calls.append(n) or n), t.Int(), t.String())
+
+        assert schema.candidates(int) == (schema.conditions[1],)
+        assert schema.candidates(float) == (schema.conditions[2],)
+        assert schema.validate(1) == 1
+        assert schema.validate(1.5) == 1.5
+        assert calls == [1.5]
+
+    def test_errors_of_skipped_conditions(self):
+        schema = b.Or(t.Int(), b.And(t.String(), NotEmpty()), t.IsNone())
+
+        with pytest.raises(SchemaError) as excinfo:
+            schema.validate(1.5)
+        assert excinfo.value.error == ("All conditions failed: Is not `None`, "
+                                       "Not of type `<class 'str'>`, "
+                                       "Not of strict type `<class 'int'>`")
+        assert schema.dispatch[float] == ()
+
+        with pytest.raises(SchemaError) as excinfo:
+            schema.validate("")
+        assert excinfo.value.error == ("All conditions failed: Is not `None`, Empty value, "
+                                       "Not of strict type `<class 'int'>`")
+
+    def test_overridden_predicates_are_not_dispatched(self):
+        class Positive(b.Type):
+            def predicate(self, data):
+                return data > 0
+
+        schema = b.Or(b.Is(None), Positive(int))
+        assert schema.candidates(float) == (schema.conditions[0],)
+        assert schema.validate(1.5) == 1.5
+
+    def test_proxies_are_not_dispatched(self):
+        class Proxy:
+            @property
+            def __class__(self):
+                return str
+
+        proxy = Proxy()
+        for schema in (b.Or(t.IsNone(), t.String()),
+                       b.Or(t.IsNone(), t.String(), adaptive=True, exclusive=True)):
+            assert schema.validate(proxy) is proxy
+            assert schema.validate(None) is None
+        schema = b.Or(t.IsNone(), t.String())
+        assert schema.candidates(Proxy) == (schema.conditions[0],)
+
+    def test_no_dispatch(self):
+        schema = b.Or(b.Pipe(int), b.Predicate(bool))
+        assert schema.dispatch is None
+        assert schema.validate("1") == "1"
+
+
+class TestTagged:
+    schema = b.Tagged("type", {
+        "click": b.Map({"type": b.Is("click"), "x": t.Int(), "y": t.Int()}),
+        "key": b.Map({"type": b.Is("key"), "code": t.String()}),
+    })
+
+    def test_dispatch(self):
+        assert self.schema.validate({"type": "click", "x": 1, "y": 2}) == {
+            "type": "click", "x": 1, "y": 2}
+        assert self.schema.validate({"type": "key", "code": "a", "x": 1}) == {
+            "type": "key", "code": "a"}
+
+        with pytest.raises(SchemaErrors) as excinfo:
+            self.schema.validate({"type": "key", "x": 1})
+        assert excinfo.value.errors == {"code": "Field `code` is required."}
+
+    def test_missing_tag(self):
+        with pytest.raises(SchemaErrors) as excinfo:
+            self.schema.validate({"code": "a"})
+        assert excinfo.value.errors == {"type": "Field `type` is required."}
+
+    def test_unknown_tag(self):
+        for tag in ("scroll", ["click"]):
+            with pytest.raises(SchemaErrors) as excinfo:
+                self.schema.validate({"type": tag})
+            assert excinfo.value.errors == {
+                "type": "Unknown `type` value `{}`, expected one of: click, key".format(tag)}
+
+    def test_custom_messages(self):
+        schema = b.Tagged("type", {"a": b.Map({})}, messages={"unknown": "Bad {field}"})
+        assert validate(schema, {"type": "b"}) == (None, {"type": "Bad type"})
+
+    def test_nested(self):
+        schema = b.Map({"event": self.schema})
+        assert validate(schema, {"event": {"type": "click", "x": "1", "y": "2"}}, fail_fast=True) == (
+            None, {"event": {"x": "Not of strict type `<class 'int'>`"}})
+
+
+class TestAdaptiveOr:
+    def conditions(self):
+        return (t.IsNone(), t.Int(), b.And(b.Type(dict), b.Map({"id": t.Int()})), t.String(),
+                b.Predicate(lambda n: n == 1.5))
+
+    def outcome(self, schema, value):
+        try:
+            return "valid", schema.validate(value)
+        except (SchemaError, SchemaErrors) as e:
+            return "invalid", render_error(e)
+        except Exception as e:
+            return "raised", type(e)
+
+    def test_same_results(self):
+        conditions = self.conditions()
+        schema = b.Or(*conditions)
+        adaptive = b.Or(*conditions, adaptive=True, exclusive=True, reorder_every=3)
+        values = [None, None, 1, "a", 1.5, 2.5, {"id": 1}, {"id": "1"}, {}, [1]] * 5
+
+        for value in values:
+            assert self.outcome(adaptive, value) == self.outcome(schema, value)
+        assert adaptive.order != tuple(range(5))
+
+        # the errors of multiple values of a previous condition are the result
+        schema = b.Or(b.Map({"id": t.Int()}), b.Map({"name": t.String()}))
+        adaptive = b.Or(b.Map({"id": t.Int()}), b.Map({"name": t.String()}),
+                        adaptive=True, exclusive=True, reorder_every=2)
+        for value in [{"id": 1}, {"name": "a"}, {"id": 1}, {"id": 1}, {"id": 1}, {}]:
+            assert self.outcome(adaptive, value) == self.outcome(schema, value)
+            assert (validate(adaptive, value, fail_fast=True) ==
+                    validate(schema, value, fail_fast=True))
+
+    def test_reorder_every_must_be_positive(self):
+        for reorder_every in (0, -1):
+            with pytest.raises(ValueError):
+                b.Or(t.IsNone(), t.Int(), adaptive=True, exclusive=True,
+                     reorder_every=reorder_every)
+
+    def test_counters_only_when_adaptive(self):
+        schema = b.Or(t.IsNone(), t.Int())
+        assert schema.hits is None and schema.order is None and schema.positions is None
+        # the dispatch table is created by the first validation
+        other = b.Or(t.IsNone(), t.Int())
+        assert schema.dispatch is other.dispatch and not schema.dispatch
+        assert schema.validate(1) == 1
+        assert schema.dispatch is not other.dispatch and not other.dispatch
+
+    def test_requires_exclusive(self):
+        with pytest.raises(ValueError):
+            b.Or(t.IsNone(), t.Int(), adaptive=True)
+
+    def test_reorder(self):
+        calls = []
+        schema = b.Or(b.Predicate(lambda n: calls.append("positive") or n > 0),
+                      b.Predicate(lambda n: calls.append("negative") or n < 0),
+                      adaptive=True, exclusive=True, reorder_every=4)
+
+        for _ in range(3):
+            assert schema.validate(1) == 1
+        assert schema.hits == [0, 3] and schema.order == (0, 1)
+        assert calls == ["negative", "positive"] * 3
+
+        # after reordering the condition that succeeds more often is tried first
+        del calls[:]
+        assert schema.validate(1) == 1
+        assert schema.order == (1, 0) and calls == ["positive"]
+        assert schema.validate(-1) == -1
+        assert calls == ["positive", "positive", "negative"]
+
+    def test_exclusive(self):
+        calls = []
+        schema = b.Or(b.Predicate(lambda n: calls.append("str") or isinstance(n, str)),
+                      b.Predicate(lambda n: calls.append("int") or isinstance(n, int)),
+                      adaptive=True, exclusive=True, reorder_every=2)
+
+        for _ in range(3):
+            assert schema.validate(1) == 1
+        del calls[:]
+        assert schema.validate(2) == 2
+        assert calls == ["int"]
+        assert schema.calls == 4 and schema.hits == [4, 0] and schema.order == (0, 1)
+
+    def test_skips_by_type(self):
+        calls = []
+        schema = b.Or(b.Predicate(lambda n: calls.append(n) or n is not None), t.IsNone(),
+                      adaptive=True, exclusive=True, reorder_every=3)
+
+        assert schema.validate(1) == 1 and schema.validate(1) == 1
+        assert schema.validate(None) is None
+        assert schema.order == (1, 0) and schema.hits == [1, 2]
+        assert calls == [1, 1]
+
+
+def test_transform():
+    schema = b.Map({
+        "id": t.Int(),
+        b.Optional("tags"): b.Or(t.IsNone(), b.And(t.String(), NotEmpty())),
+    })
+    paths = []
+
+    def visit(node, path):
+        paths.append((path, type(node).__name__))
+        return b.Pipe(str) if path == "id" else node
+
+    transformed = b.transform(schema, visit, "")
+    assert paths == [("id", "Int"), ("tags[0]", "IsNone"), ("tags[1][0]", "String"),
+                     ("tags[1][1]", "NotEmpty"), ("tags[1]", "And"), ("tags", "Or"), ("", "Map")]
+    assert transformed.validate({"id": 1, "tags": None}) == {"id": "1", "tags": None}
+    assert schema.validate({"id": 1}) == {"id": 1}
+    with pytest.raises(SchemaErrors):
+        transformed.validate({"id": 1, "tags": ""})
+
+
+def test_builtin_schemas_have_no_dict():
+    schema = b.Map({"name": b.And(t.String(), NotEmpty()), b.Optional("age"): b.Or(t.IsNone(), t.Int())})
+    nodes = [schema, schema.mapping["name"], schema.mapping["name"].conditions[0], t.Int()]
+
+    assert not any(hasattr(node, "__dict__") for node in nodes)
+    assert t.Int().message is t.Int.default_message
+    assert b.Map({"a": t.Int()}).messages is b.Map.default_messages
+    assert b.Map({"a": t.Int()}).optional is b.Map({"b": t.Int()}).optional
+
+
+def test_default_messages_are_not_shared_mutably():
+    schema = b.Map({"a": t.Int()})
+    with pytest.raises(TypeError):
+        schema.messages["required"] = "Missing {0}"
+
+    custom = b.Map({"a": t.Int()}, messages={"required": "Missing {0}"})
+    custom.messages["required"] = "Absent {0}"
+    assert b.Map({"x": t.Int()}).messages["required"] == "Field `{0}` is required."
+    assert b.Map({"x": t.Int()}, messages={"required": "Missing {0}"}).messages["required"] == (
+        "Missing {0}")
+    with pytest.raises(SchemaErrors) as excinfo:
+        b.Map({"x": t.Int()}).validate({})
+    assert excinfo.value.errors == {"x": "Field `x` is required."}
+
+    tagged = b.Tagged("type", {"a": b.Map({})})
+    with pytest.raises(TypeError):
+        tagged.messages["unknown"] = "Bad"
+
+    class CustomMap(b.Map):
+        messages = {"required": "Missing {0}"}
+
+    with pytest.raises(TypeError):
+        CustomMap({"a": t.Int()}).messages["required"] = "Absent {0}"
+
+
+def test_structural_equality():
+    assert b.And(t.String(), NotEmpty()) == b.And(t.String(), NotEmpty())
+    assert hash(b.And(t.String(), NotEmpty())) == hash(b.And(t.String(), NotEmpty()))
+    assert b.And(t.String(), NotEmpty()) != b.And(t.String(), NotEmpty("Required"))
+    assert b.Type(int) != t.Int() and t.Int() != b.StrictType(int)
+    assert b.Map({"a": t.Int()}) == b.Map({"a": t.Int()})
+    assert b.Map({"a": t.Int()}) != b.Map({b.Optional("a"): t.Int()})
+    assert b.Map({"a": t.Int()}) != b.Map({"a": t.Int()}, messages={"required": "Missing"})
+
+    adaptive = b.Or(t.IsNone(), t.Int(), adaptive=True, exclusive=True)
+    adaptive.validate(1)
+    assert adaptive == b.Or(t.IsNone(), t.Int(), adaptive=True, exclusive=True)
+    assert adaptive != b.Or(t.IsNone(), t.Int())
+
+    items = []
+    assert b.Is(items) == b.Is(items) and b.Is(items) != b.Is([])
+    assert b.Predicate(bool) == b.Predicate(bool)
+    assert b.Predicate(lambda n: n) != b.Predicate(lambda n: n)
+
+
+def test_structural_equality_of_custom_schemas():
+    class Even(b.Schema):
+        def check(self, data):
+            return (data, None) if data % 2 == 0 else (None, SchemaError("Odd"))
+
+    class Multiple(b.Predicate):
+        def __init__(self, factor):
+            super().__init__(lambda n: n % factor == 0)
+            self.factor = factor
+
+    even = Even()
+    assert even == even and even != Even()
+    assert hash(even) != hash(Even())
+    predicate = lambda n: n % 3 == 0
+    assert b.Predicate(predicate) == b.Predicate(predicate)
+    assert Multiple(3) != Multiple(3)
+
+
+def test_structural_equality_of_unhashable_parameters():
+    from skame.schemas.common import Choices
+
+    choices = Choices([[1], 2])
+    assert hash(choices) == hash(choices)
+    assert choices == choices and choices != Choices([[1], 2])
+    assert hash(b.Map({"a": choices})) == hash(b.Map({"a": choices}))
+    assert b.Map({"a": choices}) == b.Map({"a": choices})
+    assert b.Map({"a": choices}) != b.Map({"a": Choices([[1], 2])})
+
+
+def test_subclass_class_attribute_message():
+    class Positive(b.Predicate):
+        message = "Must be positive"
+
+        def __init__(self):
+            super().__init__(lambda n: n > 0)
+
+    with pytest.raises(SchemaError) as excinfo:
+        Positive().validate(-1)
+    assert excinfo.value.error == "Must be positive"
+    assert Positive.default_message == "Must be positive"
@@ -1,7 +1,8 @@
 import pytest
 
-from skame.exceptions import SchemaError
+from skame.exceptions import SchemaError, SchemaErrors
 from skame.schemas import common as c
+from skame.schemas.base import Map, Predicate
 
 
 def test_schema_choices():
@@ -30,3 +31,72 @@ def test_schema_choices():
 
     with pytest.raises(SchemaError):
         c.Choices([1,2,3]).validate([])
+
+
+def test_schema_choices_unhashable():
+    choices = c.Choices([1, [2], {"three": 3}])
+    assert choices.validate(1) == 1
+    assert choices.validate([2]) == [2]
+    assert choices.validate({"three": 3}) == {"three": 3}
+
+    with pytest.raises(SchemaError):
+        choices.validate([3])
+
+    with pytest.raises(SchemaError):
+        choices.validate((2,))
+
+
+def test_schema_choices_message():
+    with pytest.raises(SchemaError) as exc:
+        c.Choices([1, 2, 3]).validate(4)
+    assert exc.value.error == "Value not in the valid choices (1, 2, 3)"
+
+    with pytest.raises(SchemaError) as exc:
+        c.Choices(range(20000), message_limit=3).validate(-1)
+    assert exc.value.error == "Value not in the valid choices (0, 1, 2, ... (19997 more))"
+
+
+def test_schema_cached():
+    calls = []
+    schema = c.Cached(Predicate(lambda n: calls.append(n) or n > 0, "Not positive"), maxsize=2)
+
+    assert schema.validate(1) == 1
+    assert schema.validate(1) == 1
+    for _ in range(2):
+        with pytest.raises(SchemaError) as excinfo:
+            schema.validate(-1)
+        assert excinfo.value.error == "Not positive"
+    assert calls == [1, -1]
+    assert schema.cache_info() == (2, 2, 2, 2)
+
+    # values of different types are cached apart
+    assert schema.validate(1.0) == 1.0 and type(schema.validate(True)) is bool
+    # the least recently used values are evicted
+    assert schema.cache_info().currsize == 2
+    schema.validate(1)
+    assert calls == [1, -1, 1.0, True, 1]
+
+    schema.cache_clear()
+    assert schema.cache_info() == (0, 0, 2, 0)
+
+
+def test_schema_cached_unhashable():
+    schema = c.Cached(Predicate(lambda n: len(n) > 0, "Empty"))
+
+    assert schema.validate([1]) == [1]
+    with pytest.raises(SchemaError):
+        schema.validate([])
+    assert schema.cache_info() == (0, 0, 1024, 0)
+
+
+def test_schema_cached_fail_fast():
+    schema = c.Cached(Map({"a": Predicate(bool, "Empty"), "b": Predicate(bool, "Empty")}))
+    data = {"a": "", "b": ""}
+
+    assert schema.accepts_fail_fast
+    with pytest.raises(SchemaErrors) as excinfo:
+        schema.validate(data, fail_fast=True)
+    assert len(excinfo.value.errors) == 1
+    with pytest.raises(SchemaErrors) as excinfo:
+        schema.validate(data)
+    assert len(excinfo.value.errors) == 2
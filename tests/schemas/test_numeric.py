@@ -45,3 +45,39 @@ def test_max_value_schema_invalid():
     with pytest.raises(SchemaError):
         MaxValue(10).validate(20)
 
+
+
+def test_numeric_schemas_validate_array():
+    numpy = pytest.importorskip("numpy")
+    array = numpy.array([-1.0, 0.0, 5.0, 20.0])
+
+    result = IsStrictPositive().validate_array(array)
+    assert result.mask.tolist() == [False, False, True, True]
+    assert result.failed.tolist() == [0, 1]
+    assert result.messages.tolist() == ["Value must be a positive number"] * 2
+
+    assert IsPositiveOrZero().validate_array(array).failed.tolist() == [0]
+    assert MinValue(5).validate_array(array).failed.tolist() == [0, 1]
+
+    result = MaxValue(10).validate_array(array)
+    assert result.failed.tolist() == [3]
+    assert result.messages.tolist() == ["Value must be lower or equal than 10"]
+
+
+def test_and_numeric_schemas_validate_array():
+    numpy = pytest.importorskip("numpy")
+    from skame.schemas.base import And, Predicate
+
+    array = numpy.array([-1, 5, 15, 8])
+    result = And(IsPositiveOrZero(), MaxValue(10), MinValue(6)).validate_array(array)
+    assert result.mask.tolist() == [False, False, False, True]
+    assert result.failed.tolist() == [0, 1, 2]
+    assert result.messages.tolist() == [
+        "Value must be a positive number or 0",
+        "Value must be greater or equal than 6",
+        "Value must be lower or equal than 10",
+    ]
+
+    result = And(IsPositiveOrZero(), Predicate(lambda n: n % 2 == 0, message="Odd")).validate_array(array)
+    assert result.failed.tolist() == [0, 1, 2]
+    assert result.messages.tolist() == ["Value must be a positive number or 0", "Odd", "Odd"]
@@ -1,9 +1,11 @@
+import datetime
+
 import pytest
 
 from skame.exceptions import SchemaError
 from skame.schemas.strings import (Email, NotEmpty,
                                    Length, MaxLength, MinLength, URL,
-                                   Regex)
+                                   Regex, ISODate, ISODateTime, ISOTime)
 
 
 def test_email_schema_valid():
@@ -55,6 +57,28 @@ def test_url_schema_invalid():
     with pytest.raises(SchemaError):
         URL().validate("with://invalid-protocol")
 
+def test_url_schema_hosts_and_ports():
+    valid = ["http://localhost:8000/", "http://127.0.0.1", "http://[::1]:8080/path",
+             "https://sub-domain.example.co.uk.", "http://example.com?query=1",
+             "http://example.com/\n", "HTTP://" + "a" * 63 + ".com"]
+    invalid = ["http://" + "a" * 64 + ".com", "http://-example.com", "http://example-.com",
+               "http://example..com", "http://.example.com", "http://example.com:port",
+               "http://example.com/with space", "http://example.com?", "http://example.c",
+               "http://example.com\n\n", "ht tp://example.com", None, 42]
+    for url in valid:
+        assert URL().validate(url) == url
+    for url in invalid:
+        with pytest.raises(SchemaError):
+            URL().validate(url)
+
+
+def test_url_schema_adversarial_hostnames():
+    for url in ["http://" + "a." * 50000 + "-", "http://[" + "a:" * 50000 + "x",
+                "http://a." + "a-" * 50000 + "-", "http://" + ("a" * 62 + "-.") * 1000 + "com"]:
+        with pytest.raises(SchemaError):
+            URL().validate(url)
+
+
 def test_url_schema_change_error_message():
     with pytest.raises(SchemaError) as excinfo:
         URL(message="Test Message Change").validate("without-protocol")
@@ -86,6 +110,29 @@ def test_url_regex_change_error_message():
     assert excinfo.value.error == "Test Message Change"
 
 
+def test_subclasses_with_class_attribute_defaults():
+    class Slug(Regex):
+        regex = r'^[a-z-]+$'
+        message = "Invalid slug"
+
+    class GitURL(URL):
+        schemes = ['git']
+
+    class CompanyEmail(Email):
+        domain_whitelist = ['localhost']
+
+    assert Slug().validate("a-slug") == "a-slug"
+    with pytest.raises(SchemaError) as excinfo:
+        Slug().validate("NOT A SLUG!!")
+    assert excinfo.value.error == "Invalid slug"
+    assert Slug(message="Other").message == "Other"
+    assert GitURL().validate("git://example.com") == "git://example.com"
+    with pytest.raises(SchemaError):
+        GitURL().validate("http://example.com")
+    assert CompanyEmail().validate("john@localhost") == "john@localhost"
+    assert not vars(Slug())
+
+
 def test_not_empty_schema_valid():
     assert NotEmpty().validate("string") == "string"
     assert NotEmpty().validate(7) == 7
@@ -152,3 +199,54 @@ def test_min_length_schema_change_error_message():
     with pytest.raises(SchemaError) as excinfo:
         MinLength(10, message="Test Message Change").validate("test")
     assert excinfo.value.error == "Test Message Change"
+
+
+def test_iso_date_schema_valid():
+    assert ISODate().validate("2016-02-29") == datetime.date(2016, 2, 29)
+    assert ISODate().validate("2016-2-9") == datetime.date(2016, 2, 9)
+
+
+def test_iso_date_schema_invalid():
+    for value in ["2015-02-29", "2016-13-01", "20160101", "2016-01-01T00:00", " 2016-01-01",
+                  "2016-01-01\n", "", None, 20160101]:
+        with pytest.raises(SchemaError):
+            ISODate().validate(value)
+
+
+def test_iso_datetime_schema():
+    assert ISODateTime().validate("2016-02-29T10:30") == datetime.datetime(2016, 2, 29, 10, 30)
+    assert ISODateTime().validate("2016-02-29 10:30:15.250") == datetime.datetime(
+        2016, 2, 29, 10, 30, 15, 250000)
+    assert ISODateTime().validate("2016-02-29T10:30:15Z") == datetime.datetime(
+        2016, 2, 29, 10, 30, 15, tzinfo=datetime.timezone.utc)
+    assert ISODateTime().validate("2016-02-29T10:30:15+02:00").utcoffset() == datetime.timedelta(
+        hours=2)
+
+    for value in ["2016-02-29", "2016-02-29T25:00", "2016-02-29T10:30:15.2", "20160229T1030", None]:
+        with pytest.raises(SchemaError) as excinfo:
+            ISODateTime().validate(value)
+        assert excinfo.value.error == "Invalid ISO datetime"
+
+
+def test_iso_time_schema():
+    assert ISOTime().validate("10:30") == datetime.time(10, 30)
+    assert ISOTime().validate("10:30:15.123456") == datetime.time(10, 30, 15, 123456)
+    assert ISOTime().validate("10:30Z") == datetime.time(10, 30, tzinfo=datetime.timezone.utc)
+
+    for value in ["10", "10:60", "1030", "2016-02-29T10:30", None]:
+        with pytest.raises(SchemaError) as excinfo:
+            ISOTime().validate(value)
+        assert excinfo.value.error == "Invalid ISO time"
+
+
+def test_iso_date_schema_cache():
+    schema = ISODate(cache_size=2)
+
+    assert schema.validate("2016-02-29") == datetime.date(2016, 2, 29)
+    assert schema.validate("2016-02-29") == datetime.date(2016, 2, 29)
+    for _ in range(2):
+        with pytest.raises(SchemaError):
+            schema.validate("2015-02-29")
+    with pytest.raises(SchemaError):
+        schema.validate(None)
+    assert schema.cache.info() == (2, 2, 2, 2)
@@ -0,0 +1,49 @@
+import json
+
+from skame import bench
+
+
+def test_datasets_are_deterministic():
+    case = next(case for case in bench.cases() if case.name == "email")
+
+    items = bench.dataset(case, 50, 0.5, seed=1)
+    assert items == bench.dataset(case, 50, 0.5, seed=1)
+    assert items != bench.dataset(case, 50, 0.5, seed=2)
+    assert [case.schema.check(item)[1] is None for item in items].count(True) not in (0, 50)
+    assert all(case.schema.check(item)[1] is None for item in bench.dataset(case, 50, 1.0, 0))
+    assert all(case.schema.check(item)[1] is not None for item in bench.dataset(case, 50, 0.0, 0))
+
+
+def test_every_case_builds_valid_and_invalid_items():
+    for case in bench.cases():
+        items = bench.dataset(case, 5, 1.0, 0) + bench.dataset(case, 5, 0.0, 0)
+        assert [case.schema.check(item)[1] is None for item in items] == [True] * 5 + [False] * 5, \
+            case.name
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert bench.main(["-k", "map/fields=5", "-k", "url", "--size", "10", "--repeat", "1",
+                       "-o", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert sorted(results) == ["map/fields=5/valid=0.0", "map/fields=5/valid=0.5",
+                               "map/fields=5/valid=1.0", "url/valid=0.0", "url/valid=0.5",
+                               "url/valid=1.0"]
+    assert results["url/valid=1.0"]["items"] == 10
+
+    # compare against a baseline where everything was faster
+    baseline = {"results": {name: {"ns_per_item": result["ns_per_item"] / 10}
+                            for name, result in results.items()}}
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+    assert bench.main(["-k", "url", "--size", "10", "--repeat", "1", "--baseline",
+                       str(tmp_path / "baseline.json")]) == 1
+    out, err = capsys.readouterr()
+    assert "url/valid=1.0" in json.loads(out)["results"]
+    assert "slower" in err
+
+
+def test_list(capsys):
+    assert bench.main(["--list", "-k", "map/*"]) == 0
+    assert capsys.readouterr().out.split() == ["map/fields=5", "map/fields=50", "map/fields=500",
+                                               "map/depth=1", "map/depth=5", "map/depth=20"]
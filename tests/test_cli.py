@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from skame.cli import main
+from skame.hooks import global_hooks
+
+
+SCHEMA_MODULE = '''
+from skame.schemas.base import Map, And, Pipe
+from skame.schemas.types import String
+from skame.schemas.numeric import IsPositiveOrZero
+
+SCHEMA = Map({"name": String(), "age": And(Pipe(int), IsPositiveOrZero())})
+'''
+
+
+@pytest.fixture
+def schema_module(tmp_path, monkeypatch):
+    (tmp_path / "cli_schemas.py").write_text(SCHEMA_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return "cli_schemas:SCHEMA"
+
+
+@pytest.fixture
+def records(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"name": "John", "age": "28"}),
+        json.dumps({"name": "Jane", "age": -1}),
+        "",
+        "{not json",
+        "[1, 2]",
+        json.dumps({"name": "Alice", "age": 30}),
+    ]) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("extra_args", [[], ["--compile"]])
+def test_validate_command(schema_module, records, tmp_path, capsys, extra_args):
+    output, errors = tmp_path / "valid.jsonl", tmp_path / "errors.jsonl"
+    status = main(["validate", "--schema", schema_module, str(records),
+                   "--output", str(output), "--errors", str(errors)] + extra_args)
+
+    assert status == 1
+    assert [json.loads(line) for line in output.read_text().splitlines()] == [
+        {"name": "John", "age": 28},
+        {"name": "Alice", "age": 30},
+    ]
+    report = [json.loads(line) for line in errors.read_text().splitlines()]
+    assert report[0] == {"line": 2, "errors": {"age": "Value must be a positive number or 0"}}
+    assert report[1]["line"] == 4
+    assert report[1]["errors"].startswith("Invalid JSON")
+    assert report[2]["line"] == 5
+    assert report[2]["errors"].startswith("Invalid record: AttributeError")
+    assert "5 records" in capsys.readouterr().err
+
+
+def test_validate_command_standard_streams(schema_module, monkeypatch, capsys):
+    import io
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({"name": "John", "age": 1}) + "\n"))
+
+    assert main(["validate", "--schema", schema_module, "--quiet"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out) == {"name": "John", "age": 1}
+    assert err == ""
+
+
+def test_validate_command_default_streams(schema_module, records, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", records.open())
+
+    assert main(["validate", "--schema", schema_module]) == 1
+    out, err = capsys.readouterr()
+    assert len(out.splitlines()) == 2
+    # the stats follow the error report as one more JSON line
+    report = [json.loads(line) for line in err.splitlines()]
+    assert [line["line"] for line in report[:-1]] == [2, 4, 5]
+    assert report[-1]["stats"]["records"] == 5 and report[-1]["stats"]["invalid"] == 3
+
+
+def test_validate_command_stats_file(schema_module, records, tmp_path, capsys):
+    stats = tmp_path / "stats.txt"
+    main(["validate", "--schema", schema_module, str(records), "--stats", str(stats)])
+
+    assert "5 records" in stats.read_text()
+    assert len(capsys.readouterr().err.splitlines()) == 3
+
+
+def test_validate_command_global_hooks(schema_module, records, tmp_path):
+    events = []
+    global_hooks.on_start(lambda path, schema, data: events.append(data))
+    try:
+        main(["validate", "--schema", schema_module, str(records), "--quiet",
+              "--output", str(tmp_path / "valid.jsonl"), "--errors", str(tmp_path / "errors.jsonl")])
+    finally:
+        global_hooks.clear()
+    # the records that are valid JSON
+    assert len(events) == 4 and events[1] == {"name": "Jane", "age": -1}
+
+
+def test_validate_command_wrong_schema_path():
+    with pytest.raises(ValueError):
+        main(["validate", "--schema", "without-attribute", "--quiet"])
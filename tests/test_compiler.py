@@ -0,0 +1,114 @@
+import pytest
+
+from skame.compiler import compile
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.schemas import base as b
+from skame.schemas import types as t
+from skame.schemas.strings import NotEmpty, MaxLength, Email
+
+
+def outcome(validate, data):
+    try:
+        return "ok", validate(data)
+    except SchemaError as e:
+        return "error", e.error
+    except SchemaErrors as e:
+        return "errors", e.errors
+
+
+def assert_same(schema, *values):
+    compiled = compile(schema)
+    for value in values:
+        assert outcome(compiled, value) == outcome(schema.validate, value)
+
+
+def test_compile_predicates():
+    assert_same(b.Predicate(lambda n: n > 0), 1, -1)
+    assert_same(b.Type(int), 1, "1")
+    assert_same(t.Int(), 1, True, "1")
+    assert_same(t.IsNone(), None, 0)
+    assert_same(MaxLength(3), "ab", "abcd")
+
+
+def test_compile_overridden_predicates():
+    class NonBlank(b.Type):
+        def predicate(self, data):
+            return isinstance(data, self.type) and bool(data.strip())
+
+    class Falsy(b.Is):
+        def predicate(self, data):
+            return not data
+
+    assert_same(NonBlank(str), "a", " ", 1)
+    assert_same(Falsy(None), None, 0, 1)
+
+
+def test_compile_pipe():
+    assert_same(b.Pipe(int), "1", "one", None)
+    assert_same(b.Pipe(int, str), 1.0, "one")
+    assert_same(b.Pipe(int, message="Must be an int"), "1", "one")
+
+
+def test_compile_and():
+    assert_same(b.And(b.Pipe(int), b.Predicate(lambda n: n == 42)), "42", "41", "forty-two")
+
+
+def test_compile_or():
+    schema = b.Or(t.String(), b.And(b.Pipe(int), b.Predicate(lambda n: n == 42)), t.IsNone())
+    assert_same(schema, "20", 42.0, None, 20, [])
+
+
+def test_compile_fallback_to_validate():
+    assert_same(b.And(t.String(), Email()), "test@test.com", "test", 1)
+
+
+def test_compile_map():
+    schema = b.Map({
+        "name": b.And(t.String(), NotEmpty()),
+        b.Optional("age"): b.Pipe(int),
+        "address": b.Map({
+            "street": t.String(),
+            b.Optional("number"): t.Int(),
+        }),
+        b.Dependent("country"): b.Pipe(lambda data: data["address"]["street"].upper()),
+    })
+    assert_same(schema,
+                {"name": "John", "address": {"street": "Main"}},
+                {"name": "John", "age": "28", "address": {"street": "Main", "number": 1}},
+                {"name": "", "age": "old", "address": {"number": "1"}},
+                {"age": "28"},
+                {"name": "John", "address": {"street": 1}})
+
+
+def test_compile_map_failing_dependent_fields():
+    schema = b.Map({
+        "price": t.Int(),
+        b.Dependent("total"): b.Pipe(lambda data: data["price"] * data["qty"]),
+        b.Dependent("label"): b.Pipe(lambda data: data["name"].upper()),
+    })
+    assert_same(schema, {"price": 2}, {"price": 2, "qty": 1}, {"price": "2"},
+                {"price": 2, "qty": 1, "name": "a"})
+
+
+def test_compile_map_custom_messages():
+    schema = b.Map({"name": t.String()}, messages={"required": "`{0}` is missing"})
+    assert_same(schema, {}, {"name": "John"})
+
+
+def test_compile_deep_schema():
+    schema = t.Int()
+    for _ in range(30):
+        schema = b.Map({"child": b.Or(schema, t.IsNone())})
+    valid, invalid = 1, "wrong"
+    for _ in range(30):
+        valid, invalid = {"child": valid}, {"child": invalid}
+    assert_same(schema, valid, invalid)
+
+
+def test_compile_source():
+    validate = compile(b.Map({"name": t.String()}))
+    assert "def validate(v):" in validate.source
+
+    with pytest.raises(SchemaErrors) as exc:
+        validate({})
+    assert exc.value.errors == {"name": "Field `name` is required."}
@@ -0,0 +1,69 @@
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.schemas import base as b
+
+
+class Unformattable:
+    def __format__(self, format_spec):
+        raise AssertionError("The message should not be formatted")
+
+
+def test_schema_error_message():
+    assert SchemaError("Invalid").error == "Invalid"
+    assert SchemaError("Invalid", error_code="wrong").error_code == "wrong"
+
+
+def test_schema_error_lazy_message():
+    error = SchemaError("Must be {value}", params={"value": Unformattable()})
+    assert error.message == "Must be {value}"
+
+    error = SchemaError("Must be {value}", params={"value": 3})
+    assert error.error == "Must be 3"
+
+    error.error = "Custom"
+    assert error.error == "Custom"
+
+
+def test_schema_errors_lazy_messages():
+    errors = SchemaErrors({
+        "name": SchemaError("Must be {value}", params={"value": 3}),
+        "address": SchemaErrors({"street": SchemaError("Empty")}),
+        "age": "Field `age` is required.",
+    })
+    assert errors.errors == {
+        "name": "Must be 3",
+        "address": {"street": "Empty"},
+        "age": "Field `age` is required.",
+    }
+
+
+def test_schemas_do_not_format_unread_errors():
+    _, error = b.Or(b.Is(1), b.Is(2)).check(Unformattable())
+    assert error.error_code == "invalid"
+
+    schema = b.Map({"value": b.Predicate(lambda value: False), "other": b.Is(3)})
+    _, error = schema.check({"value": Unformattable()})
+    assert isinstance(error, SchemaErrors)
+
+
+def test_schema_error_str():
+    error = SchemaError("Must be {value}", params={"value": 3})
+    assert str(error) == "Must be 3"
+    assert error.args == ("Must be 3",)
+    assert str(b.Type(int).check("x")[1]) == "Not of type `<class 'int'>`"
+
+    errors = SchemaErrors({"name": SchemaError("Must be {value}", params={"value": 3})})
+    assert str(errors) == str({"name": "Must be 3"})
+
+
+def test_schema_errors_pickling():
+    import pickle
+
+    error = pickle.loads(pickle.dumps(SchemaError("Must be {value}", error_code="wrong",
+                                                  params={"value": 3})))
+    assert error.error == "Must be 3"
+    assert error.error_code == "wrong"
+
+    schema = b.Map({"a": b.Type(int), "b": b.Map({"c": b.Is(None)})})
+    _, errors = schema.check({"a": "x", "b": {"c": 1}})
+    errors = pickle.loads(pickle.dumps(errors))
+    assert errors.errors == {"a": "Not of type `<class 'int'>`", "b": {"c": "Is not `None`"}}
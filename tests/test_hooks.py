@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from skame.exceptions import SchemaError, SchemaErrors
+from skame.hooks import Hooks, global_hooks
+from skame.schemas import base as b
+from skame.schemas.strings import NotEmpty
+from skame.schemas.types import String, Int
+from skame.validator import validate, avalidate, validate_batch, clean_data_or_raise
+
+
+class Recorder:
+    def __init__(self, hooks):
+        self.events = []
+        hooks.on_start(self.start)
+        hooks.on_success(self.success)
+        hooks.on_error(self.error)
+
+    def start(self, path, schema, data):
+        self.events.append(("start", path, data))
+
+    def success(self, path, schema, elapsed, cleaned):
+        assert elapsed >= 0
+        self.events.append(("success", path, cleaned))
+
+    def error(self, path, schema, elapsed, error):
+        assert elapsed >= 0 and isinstance(error, (SchemaError, SchemaErrors))
+        self.events.append(("error", path, render(error)))
+
+
+def render(error):
+    return error.errors if isinstance(error, SchemaErrors) else error.error
+
+
+@pytest.fixture
+def global_recorder():
+    recorder = Recorder(global_hooks)
+    yield recorder
+    global_hooks.clear()
+
+
+def test_instrumented_schema():
+    hooks = Hooks()
+    recorder = Recorder(hooks)
+    schema = hooks.instrument(b.Map({"name": b.And(String(), NotEmpty()), "age": Int()}), "user")
+
+    assert schema.validate({"name": "John", "age": 1}) == {"name": "John", "age": 1}
+    assert recorder.events == [
+        ("start", "user", {"name": "John", "age": 1}),
+        ("start", "user.name", "John"),
+        ("start", "user.name[0]", "John"),
+        ("success", "user.name[0]", "John"),
+        ("start", "user.name[1]", "John"),
+        ("success", "user.name[1]", "John"),
+        ("success", "user.name", "John"),
+        ("start", "user.age", 1),
+        ("success", "user.age", 1),
+        ("success", "user", {"name": "John", "age": 1}),
+    ]
+
+    del recorder.events[:]
+    with pytest.raises(SchemaErrors):
+        schema.validate({"name": "", "age": 1})
+    assert ("error", "user.name[1]", "Empty value") in recorder.events
+    assert recorder.events[-1] == ("error", "user", {"name": "Empty value"})
+
+
+class Even(b.Schema):
+    def validate(self, data):
+        if data % 2:
+            raise SchemaError("Odd")
+        return data
+
+
+def test_remove_callback():
+    hooks = Hooks()
+    paths = []
+    callback = hooks.on_error(lambda path, schema, elapsed, error: paths.append(path))
+    schema = hooks.instrument(b.And(Int(), Even()))
+
+    with pytest.raises(SchemaError):
+        schema.validate(1)
+    assert paths == ["[1]", ""]
+
+    hooks.remove(callback)
+    assert not hooks.enabled
+    with pytest.raises(SchemaError):
+        schema.validate(1)
+    assert paths == ["[1]", ""]
+
+
+def test_global_hooks(global_recorder):
+    schema = b.Map({"age": Int()})
+
+    assert validate(schema, {"age": 1}) == ({"age": 1}, None)
+    assert validate(schema, {"age": "1"}, fail_fast=True)[1] is not None
+    assert [event[:2] for event in global_recorder.events] == [
+        ("start", ""), ("success", ""), ("start", ""), ("error", "")]
+
+    del global_recorder.events[:]
+    assert [errors for _, _, errors in validate_batch(schema, [{"age": 1}, {}])][1] is not None
+    assert [event[0] for event in global_recorder.events] == ["start", "success", "start", "error"]
+
+    del global_recorder.events[:]
+    assert asyncio.run(avalidate(schema, {"age": 1})) == ({"age": 1}, None)
+    assert [event[0] for event in global_recorder.events] == ["start", "success"]
+
+
+def test_global_hooks_on_schema_methods(global_recorder):
+    schema = b.Map({"age": Int()})
+
+    assert schema.validate({"age": 1}) == {"age": 1}
+    with pytest.raises(SchemaErrors):
+        schema.validate({"age": "1"}, fail_fast=True)
+    assert global_recorder.events == [
+        ("start", "", {"age": 1}), ("success", "", {"age": 1}),
+        ("start", "", {"age": "1"}), ("error", "", {"age": "Not of strict type `<class 'int'>`"})]
+
+    del global_recorder.events[:]
+    assert [errors for _, _, errors in schema.validate_many([{"age": 1}, {}])][1] is not None
+    assert [event[0] for event in global_recorder.events] == ["start", "success", "start", "error"]
+
+    del global_recorder.events[:]
+    assert asyncio.run(schema.avalidate({"age": 1})) == {"age": 1}
+    assert [event[0] for event in global_recorder.events] == ["start", "success"]
+
+    # the helpers call the callbacks once
+    del global_recorder.events[:]
+    assert clean_data_or_raise(schema, {"age": 1}) == {"age": 1}
+    assert [event[0] for event in global_recorder.events] == ["start", "success"]
+
+
+def test_global_hooks_disabled():
+    assert not global_hooks.enabled
+    schema = b.Map({"age": Int()})
+    assert validate(schema, {"age": 1}) == ({"age": 1}, None)
@@ -0,0 +1,89 @@
+from skame.interning import Registry, intern, default_registry
+from skame.schemas import base as b, types as t
+from skame.schemas.common import Choices, Cached
+from skame.schemas.numeric import MinValue, MaxValue
+from skame.schemas.strings import NotEmpty, Length, MaxLength
+
+
+def name_schema():
+    return b.And(t.String(), NotEmpty(), MaxLength(255))
+
+
+def test_intern_shares_identical_subtrees():
+    registry = Registry()
+    first = registry.intern(b.Map({"name": name_schema(), "age": t.Int()}))
+    second = registry.intern(b.Map({"name": name_schema(), "age": t.Int(), "city": name_schema()}))
+
+    assert second.mapping["name"] is first.mapping["name"]
+    assert second.mapping["city"] is first.mapping["name"]
+    assert second.mapping["age"] is first.mapping["age"]
+    assert registry.intern(b.Map({"name": name_schema(), "age": t.Int()})) is first
+    assert second.validate({"name": "John", "age": 1, "city": "Paris"}) == {
+        "name": "John", "age": 1, "city": "Paris"}
+    assert first in registry and len(registry) == 7
+
+
+def test_intern_keeps_unhashable_schemas():
+    registry = Registry()
+    schema = b.Map({"tags": Choices([["a"], ["b"]]), "name": name_schema()})
+
+    interned = registry.intern(schema)
+    assert interned is schema
+    assert schema.mapping["tags"] not in registry
+    assert registry.intern(name_schema()) is schema.mapping["name"]
+
+
+def test_intern_shares_caches():
+    registry = Registry()
+    first = registry.intern(b.Map({"name": Cached(name_schema())}))
+    second = registry.intern(b.Map({"alias": Cached(name_schema())}))
+
+    first.validate({"name": "John"})
+    second.validate({"alias": "John"})
+    assert first.mapping["name"].cache_info().hits == 1
+
+
+def test_default_registry():
+    try:
+        schema = intern(b.Or(t.IsNone(), name_schema()))
+        assert intern(b.Or(t.IsNone(), name_schema())) is schema
+    finally:
+        default_registry.clear()
+    assert len(default_registry) == 0
+
+
+def test_intern_in_empty_registry():
+    registry = Registry()
+    schema = intern(name_schema(), registry)
+
+    assert schema in registry and len(registry) == 4
+    assert len(default_registry) == 0
+
+
+def test_deep_schemas_are_hashed_in_linear_time():
+    import time
+
+    def nested(depth):
+        schema = t.Int()
+        for _ in range(depth):
+            schema = b.Map({"value": schema, "name": name_schema()})
+        return schema
+
+    start = time.perf_counter()
+    first, second = nested(25), nested(25)
+    assert hash(first) == hash(second) and first == second
+    registry = Registry()
+    assert registry.intern(second) is registry.intern(first)
+    assert time.perf_counter() - start < 1
+
+
+def test_intern_tells_apart_equal_parameters_of_other_types():
+    for first, second in [(MinValue(1), MinValue(1.0)), (MaxValue(1), MaxValue(1.0)),
+                          (Length(1), Length(True)), (Choices([1, 2]), Choices([True, 2.0])),
+                          (Choices((1, 2)), Choices([1, 2]))]:
+        registry = Registry()
+        assert first != second
+        assert registry.intern(first) is first
+        assert registry.intern(second) is second
+
+    assert MinValue(1) == MinValue(1) and Choices([1, 2]) == Choices([1, 2])
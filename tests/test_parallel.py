@@ -0,0 +1,28 @@
+from skame.parallel import ParallelValidator
+from skame.schemas.base import Map, And, Pipe
+from skame.schemas.numeric import IsPositiveOrZero
+
+
+SCHEMA = Map({"age": And(Pipe(int), IsPositiveOrZero())})
+
+RECORDS = [{"age": str(age)} for age in range(-5, 45)]
+
+
+def test_parallel_validator_keeps_order():
+    with ParallelValidator(SCHEMA, workers=2, chunksize=7) as validator:
+        results = list(validator.validate_many(RECORDS))
+
+    assert results == list(SCHEMA.validate_many(RECORDS))
+    assert [index for index, _, _ in results] == list(range(len(RECORDS)))
+
+
+def test_parallel_validator_import_path():
+    with ParallelValidator("test_parallel:SCHEMA", workers=2, chunksize=10) as validator:
+        results = list(validator.validate_many(iter(RECORDS)))
+
+    assert results == list(SCHEMA.validate_many(RECORDS))
+
+
+def test_parallel_validator_empty_iterable():
+    with ParallelValidator(SCHEMA, workers=1) as validator:
+        assert list(validator.validate_many([])) == []
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from skame.exceptions import SchemaErrors
+from skame.profiling import Profiler
+from skame.schemas import base as b
+from skame.schemas.numeric import IsPositiveOrZero
+from skame.schemas.strings import NotEmpty
+from skame.schemas.types import String, Int, IsNone
+
+
+def order_schema():
+    return b.Map({
+        "id": Int(),
+        "items": b.Map({
+            "name": b.And(String(), NotEmpty()),
+            "price": b.And(b.Pipe(float), IsPositiveOrZero()),
+        }),
+        b.Optional("note"): b.Or(IsNone(), String()),
+    })
+
+
+def test_profiler_stats_by_path():
+    profiler = Profiler()
+    schema = profiler.instrument(order_schema(), name="order")
+
+    assert schema.validate({"id": 1, "items": {"name": "pen", "price": "1.5"}}) == {
+        "id": 1, "items": {"name": "pen", "price": 1.5}}
+    with pytest.raises(SchemaErrors):
+        schema.validate({"id": 2, "items": {"name": "pen", "price": "-1"}, "note": None})
+
+    stats = {node.path: node for node in profiler.report()}
+    assert stats["order"].calls == 2 and stats["order"].failures == 1
+    assert stats["order.items.price"].calls == 2 and stats["order.items.price"].failures == 1
+    assert stats["order.items.price[1]"].failures == 1
+    assert stats["order.items.name"].failures == 0
+    assert stats["order.note"].calls == 1
+    assert stats["order.note[0]"].calls == 1 and "order.note[1]" not in stats
+    assert stats["order"].total >= stats["order.items"].total >= stats["order.items.price"].total
+    assert stats["order"].max <= stats["order"].total
+
+    report = profiler.format_report()
+    assert report.splitlines()[1].startswith("order ")
+    assert "order.items.price[0]" in report
+
+
+def test_profiler_leaves_schema_untouched():
+    schema = order_schema()
+    profiler = Profiler()
+    profiled = profiler.instrument(schema)
+
+    schema.validate({"id": 1, "items": {"name": "pen", "price": 1}})
+    assert profiler.report() == []
+    profiled.validate({"id": 1, "items": {"name": "pen", "price": 1}})
+    assert [node.path for node in profiler.report()][0] == ""
+
+
+def test_profiler_disable_and_reset():
+    profiler = Profiler(enabled=False)
+    schema = profiler.instrument(b.And(String(), NotEmpty()))
+
+    assert schema.validate("a") == "a"
+    assert profiler.report() == []
+
+    profiler.enabled = True
+    schema.check("a")
+    schema.check("")
+    assert [(node.path, node.calls, node.failures) for node in profiler.report()
+            if node.path == ""] == [("", 2, 1)]
+
+    profiler.reset()
+    assert profiler.report() == []
+
+
+def test_profiler_fail_fast_and_async():
+    profiler = Profiler()
+    schema = profiler.instrument(b.Map({"a": Int(), "b": Int()}))
+
+    cleaned, error = schema.check({"a": "1", "b": "2"}, fail_fast=True)
+    assert list(error.errors) == ["a"]
+    assert {node.path for node in profiler.report()} == {"", "a"}
+
+    async def available(value):
+        return True
+
+    profiler.reset()
+    schema = profiler.instrument(b.Map({"a": b.AsyncPredicate(available)}))
+    assert schema.is_async
+    assert asyncio.run(schema.avalidate({"a": 1})) == {"a": 1}
+    assert [node.calls for node in profiler.report()] == [1, 1]
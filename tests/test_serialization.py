@@ -0,0 +1,53 @@
+import pickle
+
+from skame.schemas import base as b
+from skame.schemas import types as t
+from skame.schemas.common import Choices
+from skame.schemas.numeric import IsStrictPositive, IsPositiveOrZero, MinValue, MaxValue
+from skame.schemas.strings import (NotEmpty, Regex, URL, Email, ISODate, Length, MaxLength,
+                                   MinLength)
+from skame.serialization import dumps, loads
+from skame.validator import validate
+
+
+SCHEMA = b.Map({
+    "id": t.Int(),
+    "name": b.And(t.String(), NotEmpty(), MaxLength(255), MinLength(1)),
+    "code": b.And(Length(3), Regex(regex=r"^[A-Z]+$")),
+    "price": b.And(b.Pipe(str, float), IsStrictPositive(), MinValue(1), MaxValue(100)),
+    "stock": IsPositiveOrZero(),
+    "currency": Choices(["EUR", "USD", [1]], message_limit=2),
+    b.Optional("url"): b.Or(t.IsNone(), URL()),
+    b.Optional("email"): Email(domain_whitelist=["localhost"]),
+    b.Optional("date"): ISODate(),
+    b.Optional("flags"): b.Or(t.List(), t.Dict(), t.Bool(), t.Float(), t.Complex(),
+                              t.Date(), t.DateTime(), message="Wrong flags"),
+}, messages={"required": "`{0}` is missing"})
+
+VALID = {"id": 1, "name": "Apple", "code": "APL", "price": 2, "stock": 0, "currency": "EUR",
+         "url": "http://example.com", "email": "test@localhost", "date": "2016-01-01",
+         "flags": [1]}
+INVALID = {"id": "1", "name": "", "code": "apple", "price": -1, "stock": -1, "currency": "GBP",
+           "url": "example", "email": "test", "date": "2016", "flags": "yes"}
+
+
+def test_builtin_schemas_pickle():
+    schema = pickle.loads(pickle.dumps(SCHEMA))
+    assert validate(schema, VALID) == validate(SCHEMA, VALID)
+    assert validate(schema, INVALID) == validate(SCHEMA, INVALID)
+    assert validate(schema, {}) == validate(SCHEMA, {})
+
+
+def test_dumps_loads():
+    data = dumps(SCHEMA)
+    assert isinstance(data, bytes)
+
+    schema = loads(data)
+    assert [field.key for field in schema.plan] == [field.key for field in SCHEMA.plan]
+    assert validate(schema, VALID) == validate(SCHEMA, VALID)
+    assert validate(schema, INVALID) == validate(SCHEMA, INVALID)
+
+
+def test_dumps_only_parameters():
+    choices = Choices(list(range(1000)))
+    assert len(dumps(choices)) < len(pickle.dumps(choices.choices)) + 200
@@ -0,0 +1,52 @@
+import pytest
+
+from skame.exceptions import SchemaError
+from skame.utils import compose, LRUCache, ResultCache
+
+
+def test_compose():
+    assert compose(str, len)("hello") == "5"
+    assert compose(len, str, abs)(-123) == 3
+
+
+def test_compose_long_chain():
+    increments = [lambda n: n + 1] * 10000
+    assert compose(*increments)(0) == 10000
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.info() == (3, 1, 2, 2)
+    with pytest.raises(TypeError):
+        cache.get(["unhashable"])
+
+    cache.clear()
+    assert len(cache) == 0 and cache.info() == (0, 0, 2, 0)
+
+
+def test_result_cache():
+    calls = []
+
+    def check(data):
+        calls.append(data)
+        if not data:
+            raise SchemaError("Empty")
+        return data, None
+
+    cache = ResultCache(4)
+    assert cache.check(check, "a") == ("a", None)
+    assert cache.check(check, "a") == ("a", None)
+    assert cache.check(check, "")[1].error == "Empty"
+    assert cache.check(check, "")[1].error == "Empty"
+    # values of different types and unhashable values
+    assert cache.check(check, 1) == (1, None) and cache.check(check, True) == (True, None)
+    assert cache.check(check, ["a"]) == (["a"], None)
+    assert calls == ["a", "", 1, True, ["a"]]
+    assert cache.info() == (2, 4, 4, 4)